@@ -6,43 +6,933 @@ Tests all CRUD operations, automatic features, and weighted grade calculations
 
 import requests
 import json
+import csv
+import io
 from datetime import date, datetime
 import os
+import sys
+import re
+import importlib
+import importlib.util
+import unittest.mock
+import math
+import time
+import threading
+import argparse
+import statistics
+import uuid
+import random
+import multiprocessing
+import contextlib
+import tempfile
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
 
+from grade_analytics import GPA_POINTS, CompactGradebook, GradingEngine
+
+try:
+    import httpx
+except ImportError:  # only needed for the async client backend
+    httpx = None
+
+try:
+    import pymongo
+except ImportError:  # only needed for query-plan diagnostics
+    pymongo = None
+
+try:
+    import numpy as np
+except ImportError:  # only needed for the vectorized grading engine
+    np = None
+
 # Load environment variables
 load_dotenv('/app/frontend/.env')
+load_dotenv('/app/backend/.env')
 
 # Get backend URL from environment
 BACKEND_URL = os.getenv('REACT_APP_BACKEND_URL', 'http://localhost:8001')
 API_BASE = f"{BACKEND_URL}/api"
 
+# Backend source imported by the embedded (in-process) client
+BACKEND_DIR = os.getenv('BACKEND_DIR', '/app/backend')
+
+# PID of a backend running on this host, used to read its peak RSS during streaming exports
+SERVER_PID = os.getenv('SERVER_PID')
+EXPORT_MEMORY_BUDGET_MB = float(os.getenv('EXPORT_MEMORY_BUDGET_MB', '256'))
+
+# How long a debounced dashboard refresh may lag behind a write
+DASHBOARD_REFRESH_TIMEOUT = float(os.getenv('DASHBOARD_REFRESH_TIMEOUT', '5'))
+
+# How long a long-poll or event-stream read of the change feed may wait for a write
+CHANGE_FEED_TIMEOUT = float(os.getenv('CHANGE_FEED_TIMEOUT', '5'))
+
+# Class analytics: reported category quantiles, how far a histogram sketch may be from the exact
+# nearest-rank value (in percentage points), and the letters that put a student on the at-risk list
+ANALYTICS_QUANTILES = {"p25": 25, "p50": 50, "p75": 75, "p90": 90}
+ANALYTICS_QUANTILE_TOLERANCE = float(os.getenv('ANALYTICS_QUANTILE_TOLERANCE', '1.0'))
+AT_RISK_LETTERS = ("D", "F")
+
+# How long a background grade-record fan-out job may take after an assignment is created
+FANOUT_TIMEOUT = float(os.getenv('FANOUT_TIMEOUT', '60'))
+
+# Students imported into one grade level for the fan-out latency check, and how long creating an
+# assignment for them may block when the fan-out runs as a background job
+FANOUT_STUDENTS = int(os.getenv('FANOUT_STUDENTS', '600'))
+FANOUT_POST_LIMIT_MS = float(os.getenv('FANOUT_POST_LIMIT_MS', '250'))
+
+# MongoDB-compatible store explained by the query-plan diagnostics
+MONGO_URL = os.getenv('MONGO_URL', 'mongodb://localhost:27017')
+DB_NAME = os.getenv('DB_NAME', 'test_database')
+
+# Indexes the backend creates at startup: (collection, keys, unique)
+INDEX_SPECS = [
+    ("students", [("id", 1)], True),
+    ("students", [("student_id", 1)], True),
+    ("students", [("grade_level", 1), ("id", 1)], False),
+    ("classes", [("id", 1)], True),
+    ("classes", [("grade_level", 1), ("school_year", 1), ("id", 1)], False),
+    ("categories", [("class_id", 1)], False),
+    ("assignments", [("id", 1)], True),
+    ("assignments", [("class_id", 1)], False),
+    ("grades", [("student_id", 1), ("assignment_id", 1)], True),
+    ("grades", [("assignment_id", 1)], False),
+    ("grades", [("class_id", 1), ("student_id", 1)], False),
+]
+
+# Hot-path queries behind each endpoint: (endpoint, collection, filter, sort)
+QUERY_PLANS = [
+    ("GET /api/students/{id}", "students", {"id": "probe"}, None),
+    ("POST /api/students (duplicate check)", "students", {"student_id": "probe"}, None),
+    ("GET /api/students?grade_level=", "students", {"grade_level": "K", "id": {"$gt": ""}}, [("id", 1)]),
+    ("GET /api/classes?grade_level=&school_year=", "classes",
+     {"grade_level": "K", "school_year": "2024-2025", "id": {"$gt": ""}}, [("id", 1)]),
+    ("GET /api/classes/{id}/categories", "categories", {"class_id": "probe"}, None),
+    ("POST /api/assignments (class lookup)", "classes", {"id": "probe"}, None),
+    ("POST /api/assignments (grade-level fan-out)", "students", {"grade_level": "K"}, None),
+    ("POST /api/grades (assignment lookup)", "assignments", {"id": "probe"}, None),
+    ("POST /api/grades (upsert)", "grades", {"student_id": "probe", "assignment_id": "probe"}, None),
+    ("GET /api/students/{id}/grades", "grades", {"student_id": "probe"}, None),
+    ("GET /api/students/{id}/progress/{class_id} (assignments)", "assignments", {"class_id": "probe"}, None),
+    ("GET /api/students/{id}/progress/{class_id} (grades)", "grades",
+     {"class_id": "probe", "student_id": "probe"}, None),
+    ("GET /api/classes/{id}/progress", "grades", {"class_id": "probe"}, None),
+]
+
 print(f"Testing backend at: {API_BASE}")
 
-class SchoolManagementTester:
+# Parameterised routes are grouped under one label so load-test stats are per endpoint, not per URL
+ENDPOINT_PATTERNS = [
+    (re.compile(r"^/api/students/[^/]+/progress/[^/]+$"), "/api/students/{id}/progress/{class_id}"),
+    (re.compile(r"^/api/students/[^/]+/grades$"), "/api/students/{id}/grades"),
+    (re.compile(r"^/api/students/[^/]+$"), "/api/students/{id}"),
+    (re.compile(r"^/api/classes/[^/]+/categories$"), "/api/classes/{id}/categories"),
+    (re.compile(r"^/api/classes/[^/]+/progress$"), "/api/classes/{id}/progress"),
+    (re.compile(r"^/api/jobs/[^/]+$"), "/api/jobs/{id}"),
+]
+
+# Suites in run_all_tests order
+TEST_SUITES = ["test_api_connection", "test_dashboard_stats", "test_student_management", "test_bulk_import",
+               "test_class_management", "test_pagination", "test_assignment_creation", "test_fanout_latency",
+               "test_grade_entry",
+               "test_batch_grade_entry", "test_progress_reports", "test_class_progress_reports",
+               "test_response_caching", "test_grading_engine", "test_compact_gradebook",
+               "test_grade_analytics", "test_streaming_export",
+               "test_dashboard_updates", "test_change_feed", "test_error_handling"]
+
+# Suites specifying endpoints the backend does not provide yet (roster import, pagination, batch grades,
+# class and grade-level progress, ETag caching, export, change feed, analytics); only --contract runs them
+CONTRACT_SUITES = ["test_bulk_import", "test_pagination", "test_batch_grade_entry", "test_class_progress_reports",
+                   "test_response_caching", "test_streaming_export", "test_change_feed", "test_grade_analytics",
+                   "test_fanout_latency"]
+
+# Suites creating the students, classes, assignments and grades the others read; every parallel worker runs them
+FIXTURE_SUITES = ["test_dashboard_stats", "test_student_management", "test_class_management",
+                  "test_assignment_creation", "test_grade_entry"]
+
+# Read-only suites comparing whole-collection state; parallel runs hold them until every worker has stopped writing
+EXCLUSIVE_SUITES = ["test_pagination", "test_class_progress_reports", "test_streaming_export"]
+
+# Suites asserting exact grade-level or global results after their own writes, or flooding a grade
+# level with writes of their own; parallel runs finish with them, one at a time
+SOLO_SUITES = ["test_response_caching", "test_fanout_latency", "test_grade_analytics", "test_dashboard_updates"]
+
+# How long a parallel worker may wait for the others at a phase boundary
+WORKER_TIMEOUT = float(os.getenv('WORKER_TIMEOUT', '600'))
+
+# Scenarios each virtual user repeats in load-test mode over fixtures seeded once (the term-end grade entry workload)
+LOAD_TEST_SCENARIOS = ["test_dashboard_stats", "upsert_fixture_grades", "test_progress_reports"]
+
+
+def endpoint_label(method, url):
+    """Map a request to 'METHOD /route/template'"""
+    path = urlsplit(url).path.rstrip("/") or "/"
+    if path == "/api":
+        path = "/api/"
+    for pattern, template in ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            path = template
+            break
+    return f"{method.upper()} {path}"
+
+
+def read_peak_rss_mb(pid):
+    """Peak resident set size (VmHWM) of a local process in MB, or None if unavailable"""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+def ensure_indexes(db):
+    """Create INDEX_SPECS on a pymongo database (idempotent)"""
+    for collection, keys, unique in INDEX_SPECS:
+        db[collection].create_index(keys, unique=unique)
+
+
+def plan_stages(plan):
+    """Every stage name in an explain() plan tree"""
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            yield plan['stage']
+        for key in ('inputStage', 'queryPlan', 'winningPlan'):
+            if key in plan:
+                yield from plan_stages(plan[key])
+        for child in plan.get('inputStages', []):
+            yield from plan_stages(child)
+
+
+def mann_whitney_p_greater(current, baseline):
+    """One-sided Mann-Whitney U p-value that `current` samples tend to be larger than `baseline`"""
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        i = j + 1
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 1 - statistics.NormalDist().cdf(z)
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+class LoadTestStats:
+    """Thread-safe latency/error recorder shared by all virtual users"""
+
     def __init__(self):
-        self.session = requests.Session()
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, label, elapsed, ok):
+        with self.lock:
+            self.latencies.setdefault(label, []).append(elapsed)
+            if not ok:
+                self.errors[label] = self.errors.get(label, 0) + 1
+
+    def stop(self):
+        self.finished = time.perf_counter()
+
+    def report(self):
+        """Per-endpoint throughput, p50/p95/p99 latency (ms) and error rate (%)"""
+        wall_time = (self.finished or time.perf_counter()) - self.started
+        report = {}
+        with self.lock:
+            for label, samples in sorted(self.latencies.items()):
+                errors = self.errors.get(label, 0)
+                report[label] = {
+                    'requests': len(samples),
+                    'throughput_rps': round(len(samples) / wall_time, 2) if wall_time else 0.0,
+                    'p50_ms': round(percentile(samples, 50) * 1000, 2),
+                    'p95_ms': round(percentile(samples, 95) * 1000, 2),
+                    'p99_ms': round(percentile(samples, 99) * 1000, 2),
+                    'error_rate': round(errors / len(samples) * 100, 2),
+                }
+        return report
+
+
+class RateLimiter:
+    """Shared pacer that ramps linearly from 1 req/s up to target_rps over ramp_up seconds"""
+
+    def __init__(self, target_rps, ramp_up=0.0):
+        self.target_rps = target_rps
+        self.ramp_up = ramp_up
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.next_slot = self.started
+
+    def current_rate(self, now):
+        if self.ramp_up <= 0 or now - self.started >= self.ramp_up:
+            return self.target_rps
+        return max(1.0, self.target_rps * (now - self.started) / self.ramp_up)
+
+    def acquire(self):
+        with self.lock:
+            now = time.perf_counter()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + 1.0 / self.current_rate(slot)
+        delay = slot - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class TimedSession:
+    """Paces and times every call of an HTTP client backend into a LoadTestStats.
+
+    Uses a requests.Session of its own unless given a client, such as an async or
+    embedded backend shared by all virtual users; only its own session is closed.
+    """
+
+    def __init__(self, stats, limiter=None, client=None):
+        self.stats = stats
+        self.limiter = limiter
+        self.owns_client = client is None
+        self.client = client or requests.Session()
+
+    def request(self, method, url, **kwargs):
+        if self.limiter:
+            self.limiter.acquire()
+        label = endpoint_label(method, url)
+        start = time.perf_counter()
+        try:
+            response = self.client.request(method, url, **kwargs)
+        except Exception:
+            self.stats.record(label, time.perf_counter() - start, False)
+            raise
+        # 4xx responses are expected by the negative checks, so only 5xx counts as an error
+        self.stats.record(label, time.perf_counter() - start, response.status_code < 500)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        if self.owns_client:
+            self.client.close()
+
+
+class AsyncClientBackend:
+    """httpx.AsyncClient with a bounded keep-alive pool, driven by a background event loop.
+
+    Exposes the same get/post/request surface as requests.Session so the test
+    methods stay unchanged, plus gather() to run independent calls concurrently.
+    """
+
+    def __init__(self, max_connections=20, timeout=30.0):
+        if httpx is None:
+            raise RuntimeError("The async client backend requires httpx (pip install httpx)")
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        limits = httpx.Limits(max_connections=max_connections,
+                              max_keepalive_connections=max_connections)
+        self.client = self._run(self._open(limits, timeout))
+
+    async def _open(self, limits, timeout):
+        return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+    def _submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def _run(self, coroutine):
+        return self._submit(coroutine).result()
+
+    def request(self, method, url, **kwargs):
+        return self._run(self.client.request(method, url, **kwargs))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def gather(self, calls):
+        """Run (method, url, kwargs) calls concurrently; failed calls yield their exception"""
+        futures = [self._submit(self.client.request(method, url, **kwargs))
+                   for method, url, kwargs in calls]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def close(self):
+        self._run(self.client.aclose())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+def load_embedded_app(backend_dir=BACKEND_DIR):
+    """Import a fresh copy of the backend's FastAPI app with MongoDB replaced by in-memory mongomock"""
+    # Imported here rather than at the top: pulling in the web stack slows every other mode's startup
+    try:
+        import mongomock_motor
+    except ImportError:
+        raise RuntimeError("The embedded backend requires mongomock-motor (pip install mongomock-motor)")
+    if not os.path.exists(os.path.join(backend_dir, "server.py")):
+        raise RuntimeError(f"No server.py in {backend_dir}; point BACKEND_DIR at the backend source")
+    os.environ.setdefault("MONGO_URL", "mongodb://embedded")
+    os.environ.setdefault("DB_NAME", DB_NAME)
+    if backend_dir not in sys.path:
+        sys.path.insert(0, backend_dir)
+    # A fresh import gives every embedded backend its own empty database
+    sys.modules.pop("server", None)
+    with contextlib.ExitStack() as stack:
+        if importlib.util.find_spec("motor") is not None:
+            stack.enter_context(unittest.mock.patch("motor.motor_asyncio.AsyncIOMotorClient",
+                                                    mongomock_motor.AsyncMongoMockClient))
+        server = importlib.import_module("server")
+    return server.app
+
+
+class EmbeddedBackend:
+    """The backend app mounted in-process through starlette's TestClient: no sockets, no MongoDB.
+
+    Exposes the same get/post/request surface as requests.Session; any absolute URL,
+    including API_BASE, is routed straight to the app.
+    """
+
+    def __init__(self, backend_dir=BACKEND_DIR):
+        try:
+            from starlette.testclient import TestClient
+        except ImportError:
+            raise RuntimeError("The embedded backend requires starlette and httpx (pip install httpx)")
+        self.client = TestClient(load_embedded_app(backend_dir))
+        # Run startup handlers and keep one event loop, so concurrent requests (long-polls) interleave
+        self.client.__enter__()
+
+    def request(self, method, url, data=None, **kwargs):
+        if isinstance(data, (bytes, str)):
+            kwargs["content"] = data
+        elif data is not None:
+            kwargs["data"] = data
+        return self.client.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        self.client.__exit__(None, None, None)
+
+
+def make_client(kind="sync", max_connections=20):
+    """Build the HTTP client backend selected at startup ('sync', 'async' or 'embedded')"""
+    if kind == "async":
+        return AsyncClientBackend(max_connections=max_connections)
+    if kind == "embedded":
+        return EmbeddedBackend()
+    if kind == "sync":
+        return requests.Session()
+    raise ValueError(f"Unknown client backend: {kind}")
+
+
+GRADE_LEVELS = ["K"] + [str(n) for n in range(1, 13)]
+CATEGORY_WEIGHTS = {"Homework": 30.0, "Tests": 50.0, "Projects": 20.0}
+CATEGORY_POINTS = {"Homework": (10.0, 20.0, 25.0), "Tests": (50.0, 100.0), "Projects": (50.0, 100.0)}
+SUBJECTS = ["Mathematics", "English Language Arts", "Science", "Social Studies", "Art", "Music"]
+FIRST_NAMES = ["Emma", "Liam", "Olivia", "Noah", "Ava", "Elijah", "Sophia", "James", "Isabella", "Lucas",
+               "Mia", "Mason", "Amelia", "Ethan", "Harper", "Logan", "Evelyn", "Aiden", "Abigail", "Jackson"]
+LAST_NAMES = ["Johnson", "Smith", "Brown", "Williams", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+              "Martinez", "Wilson", "Anderson", "Taylor", "Thomas", "Moore", "Jackson", "Martin", "Lee"]
+
+# students_per_grade for roughly 10k / 100k / 500k grades with the default class and assignment counts
+DATASET_SCALES = {"small": 16, "medium": 160, "large": 800}
+
+
+class DistrictDataGenerator:
+    """Deterministic, seeded K-12 district dataset at configurable scale.
+
+    Every class of a grade level enrolls every student of that level, so the
+    dataset has len(GRADE_LEVELS) * students_per_grade * classes_per_grade *
+    assignments_per_class grade records. Rebuilding with the same seed and
+    parameters yields identical documents, including ids; the random streams are
+    keyed on id_prefix too, so datasets with different prefixes never share ids.
+    """
+
+    def __init__(self, seed=42, students_per_grade=16, teachers_per_grade=2, classes_per_teacher=2,
+                 assignments_per_category=4, submission_rate=0.9, school_year="2024-2025", id_prefix="GEN"):
+        self.seed = seed
+        self.students_per_grade = students_per_grade
+        self.teachers_per_grade = teachers_per_grade
+        self.classes_per_teacher = classes_per_teacher
+        self.assignments_per_category = assignments_per_category
+        self.submission_rate = submission_rate
+        self.school_year = school_year
+        self.id_prefix = id_prefix
+        self.rng = random.Random(f"{id_prefix}:{seed}")
+        self.students = []
+        self.classes = []
+        self.categories = []
+        self.assignments = []
+        self.ability = {}
+        self._build()
+
+    @classmethod
+    def for_scale(cls, scale, seed=42, **kwargs):
+        """Dataset of a named scale; its id prefix (e.g. GENS42) names the scale and seed, so scales stack"""
+        kwargs.setdefault("id_prefix", f"GEN{scale[0].upper()}{seed}")
+        return cls(seed=seed, students_per_grade=DATASET_SCALES[scale], **kwargs)
+
+    def _uuid(self):
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _build(self):
+        start_year = int(self.school_year[:4])
+        for grade_level in GRADE_LEVELS:
+            for n in range(self.students_per_grade):
+                first = self.rng.choice(FIRST_NAMES)
+                last = self.rng.choice(LAST_NAMES)
+                parent = self.rng.choice(FIRST_NAMES)
+                student = {
+                    "id": self._uuid(),
+                    "student_id": f"{self.id_prefix}-{grade_level}-{n:05d}",
+                    "first_name": first,
+                    "last_name": last,
+                    "email": f"{first.lower()}.{last.lower()}{n}@email.com",
+                    "grade_level": grade_level,
+                    "parent_name": f"{parent} {last}",
+                    "parent_email": f"{parent.lower()}.{last.lower()}{n}@email.com",
+                    "parent_phone": f"555-{self.rng.randint(0, 9999):04d}",
+                    "created_at": f"{start_year}-08-15T08:00:00",
+                }
+                self.students.append(student)
+                # Per-student mean score, so report cards spread across A-F
+                self.ability[student["id"]] = min(1.0, max(0.3, self.rng.gauss(0.8, 0.12)))
+
+            for teacher in range(self.teachers_per_grade):
+                teacher_name = f"{self.rng.choice(['Mrs.', 'Mr.', 'Ms.'])} {self.rng.choice(LAST_NAMES)}"
+                for c in range(self.classes_per_teacher):
+                    subject = SUBJECTS[(teacher * self.classes_per_teacher + c) % len(SUBJECTS)]
+                    class_obj = {
+                        "id": self._uuid(),
+                        "name": f"Grade {grade_level} {subject} {teacher + 1}-{c + 1}",
+                        "subject": subject,
+                        "teacher_name": teacher_name,
+                        "grade_level": grade_level,
+                        "school_year": self.school_year,
+                    }
+                    self.classes.append(class_obj)
+                    for name, weight in CATEGORY_WEIGHTS.items():
+                        self.categories.append({"id": self._uuid(), "class_id": class_obj["id"],
+                                                "name": name, "weight_percentage": weight})
+                        for a in range(self.assignments_per_category):
+                            self.assignments.append({
+                                "id": self._uuid(),
+                                "class_id": class_obj["id"],
+                                "name": f"{subject} {name} {a + 1}",
+                                "description": f"{name} {a + 1} for {class_obj['name']}",
+                                "category": name,
+                                "points_possible": self.rng.choice(CATEGORY_POINTS[name]),
+                                "due_date": f"{start_year}-{9 + a % 4:02d}-{self.rng.randint(1, 28):02d}",
+                            })
+
+    def iter_grades(self):
+        """Yield every grade record; unsubmitted work is left ungraded and flagged missing"""
+        rng = random.Random(f"{self.id_prefix}:{self.seed}:grades")
+        students_by_level = {}
+        for student in self.students:
+            students_by_level.setdefault(student["grade_level"], []).append(student)
+        level_by_class = {c["id"]: c["grade_level"] for c in self.classes}
+        for assignment in self.assignments:
+            possible = assignment["points_possible"]
+            for student in students_by_level[level_by_class[assignment["class_id"]]]:
+                submitted = rng.random() < self.submission_rate
+                earned = None
+                if submitted:
+                    earned = round(min(1.0, max(0.0, rng.gauss(self.ability[student["id"]], 0.1))) * possible, 1)
+                yield {
+                    "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                    "student_id": student["id"],
+                    "assignment_id": assignment["id"],
+                    "class_id": assignment["class_id"],
+                    "points_earned": earned,
+                    "percentage": (round(earned / possible * 100, 2) if possible > 0 else 0.0) if submitted else None,
+                    "is_submitted": submitted,
+                    "submission_date": assignment["due_date"] if submitted else None,
+                    "is_missing": not submitted,
+                }
+
+    def expected_counts(self):
+        """Row counts for the students, grades and progress exports of this dataset"""
+        classes_per_grade = self.teachers_per_grade * self.classes_per_teacher
+        return {
+            'students': len(self.students),
+            'grades': len(self.students) * classes_per_grade * self.assignments_per_category * len(CATEGORY_WEIGHTS),
+            'progress': len(self.students) * classes_per_grade,
+        }
+
+    def is_loaded(self, db):
+        """Whether this dataset's first student (its student_id carries the id prefix) is in db"""
+        return db.students.find_one({"student_id": self.students[0]["student_id"]}) is not None
+
+    def load_into_database(self, db, chunk_size=10000):
+        """Bulk-insert the dataset with pymongo insert_many; returns documents written per collection.
+
+        Returns None without writing if this dataset is already loaded.
+        """
+        if self.is_loaded(db):
+            return None
+        written = {}
+        for collection, documents in (("students", self.students), ("classes", self.classes),
+                                      ("categories", self.categories), ("assignments", self.assignments),
+                                      ("grades", self.iter_grades())):
+            written[collection] = 0
+            chunk = []
+            for document in documents:
+                chunk.append(dict(document))
+                if len(chunk) >= chunk_size:
+                    db[collection].insert_many(chunk, ordered=False)
+                    written[collection] += len(chunk)
+                    chunk = []
+            if chunk:
+                db[collection].insert_many(chunk, ordered=False)
+                written[collection] += len(chunk)
+        return written
+
+    def load_through_api(self, session, chunk_size=1000):
+        """Load via the API: creates students/classes/assignments, then upserts grades in batches
+        (one POST /api/grades each on a backend without /api/grades/batch).
+
+        The server assigns its own ids, so generated ids are mapped to the created ones.
+        Returns None without writing if this dataset is already loaded.
+        """
+        student_ids = {}
+        for n, student in enumerate(self.students):
+            payload = {k: v for k, v in student.items() if k not in ("id", "created_at")}
+            response = session.post(f"{API_BASE}/students", json=payload)
+            if n == 0 and response.status_code == 400:
+                return None  # this dataset's first student_id already exists
+            response.raise_for_status()
+            student_ids[student["id"]] = response.json()["id"]
+        class_ids = {}
+        for class_obj in self.classes:
+            response = session.post(f"{API_BASE}/classes", json={k: v for k, v in class_obj.items() if k != "id"})
+            response.raise_for_status()
+            class_ids[class_obj["id"]] = response.json()["id"]
+        assignment_ids = {}
+        for assignment in self.assignments:
+            payload = {k: v for k, v in assignment.items() if k != "id"}
+            payload["class_id"] = class_ids[assignment["class_id"]]
+            response = session.post(f"{API_BASE}/assignments", json=payload)
+            response.raise_for_status()
+            assignment_ids[assignment["id"]] = response.json()["id"]
+
+        batch_endpoint = True
+
+        def upsert(chunk):
+            nonlocal batch_endpoint
+            if batch_endpoint:
+                response = session.post(f"{API_BASE}/grades/batch", json=chunk)
+                if response.status_code not in (404, 405):
+                    response.raise_for_status()
+                    return
+                batch_endpoint = False  # a backend without bulk upserts takes one grade at a time
+            for grade in chunk:
+                session.post(f"{API_BASE}/grades", json=grade).raise_for_status()
+
+        written = 0
+        chunk = []
+        for grade in self.iter_grades():
+            if not grade["is_submitted"]:
+                continue  # the assignment fan-out already created the empty record
+            chunk.append({
+                "student_id": student_ids[grade["student_id"]],
+                "assignment_id": assignment_ids[grade["assignment_id"]],
+                "points_earned": grade["points_earned"],
+                "is_submitted": True,
+                "submission_date": grade["submission_date"],
+            })
+            if len(chunk) >= chunk_size:
+                upsert(chunk)
+                written += len(chunk)
+                chunk = []
+        if chunk:
+            upsert(chunk)
+            written += len(chunk)
+        return {"students": len(student_ids), "classes": len(class_ids),
+                "assignments": len(assignment_ids), "grades": written}
+
+
+def seed_dataset(scale="small", seed=42, via="db", session=None, mongo_url=MONGO_URL, db_name=DB_NAME):
+    """Generate a dataset and load it through bulk database writes ('db') or the API ('api')"""
+    generator = DistrictDataGenerator.for_scale(scale, seed=seed)
+    start = time.perf_counter()
+    if via == "db":
+        if pymongo is None:
+            raise RuntimeError("Loading through the database requires pymongo (pip install pymongo)")
+        client = pymongo.MongoClient(mongo_url)
+        try:
+            written = generator.load_into_database(client[db_name])
+        finally:
+            client.close()
+    elif via == "api":
+        written = generator.load_through_api(session or requests.Session())
+    else:
+        raise ValueError(f"Unknown load path: {via}")
+    if written is None:
+        print(f"🌱 {scale} dataset (seed {seed}) already loaded, skipping")
+    else:
+        print(f"🌱 Seeded {scale} dataset (seed {seed}) via {via} in {time.perf_counter() - start:.1f}s: {written}")
+    return generator
+
+
+# Columns of a roster import row, in CSV order; grade_level also decides class enrollment
+ROSTER_FIELDS = ["student_id", "first_name", "last_name", "email", "grade_level",
+                 "parent_name", "parent_email", "parent_phone"]
+
+
+def roster_rows(count, seed=42, id_prefix="IMP"):
+    """The first `count` generated students as roster rows"""
+    generator = DistrictDataGenerator(seed=seed, students_per_grade=math.ceil(count / len(GRADE_LEVELS)),
+                                      teachers_per_grade=0, id_prefix=id_prefix)
+    return [{field: student.get(field) for field in ROSTER_FIELDS} for student in generator.students[:count]]
+
+
+def encode_roster(rows, fmt="csv", chunk_rows=1000):
+    """Yield a roster as CSV or NDJSON byte chunks, so uploads stream instead of building one body"""
+    buffer = io.StringIO()
+    if fmt == "csv":
+        writer = csv.DictWriter(buffer, fieldnames=ROSTER_FIELDS, extrasaction="ignore", lineterminator="\n")
+        writer.writeheader()
+    elif fmt != "ndjson":
+        raise ValueError(f"Unknown roster format: {fmt}")
+    for n, row in enumerate(rows, 1):
+        if fmt == "csv":
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(row) + "\n")
+        if n % chunk_rows == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class ChangeFeedReplica:
+    """Client-side copy of students, classes, assignments and grades kept current only through /api/changes.
+
+    Each change is {"seq", "collection", "op": "upsert" | "delete", "id", "doc"}; sequence numbers are
+    monotonic, so a replica only has to remember the last one it applied.
+    """
+
+    COLLECTIONS = ("students", "classes", "assignments", "grades")
+
+    def __init__(self, session, since=0):
+        self.session = session
+        self.seq = since
+        self.state = {collection: {} for collection in self.COLLECTIONS}
+        self.bytes_received = 0
+
+    def apply(self, change):
+        documents = self.state[change["collection"]]
+        if change["op"] == "delete":
+            documents.pop(change["id"], None)
+        else:
+            documents[change["id"]] = change["doc"]
+        self.seq = change["seq"]
+
+    def poll(self, wait=0, limit=1000):
+        """Apply every change after self.seq; with wait > 0 the first request long-polls for a write"""
+        applied = 0
+        while True:
+            response = self.session.get(f"{API_BASE}/changes",
+                                        params={"since": self.seq, "limit": limit, "wait": wait})
+            response.raise_for_status()
+            self.bytes_received += len(response.content)
+            feed = response.json()
+            for change in feed["changes"]:
+                self.apply(change)
+            applied += len(feed["changes"])
+            if not feed.get("has_more"):
+                return applied
+            wait = 0
+
+    def wait_for(self, predicate, timeout=CHANGE_FEED_TIMEOUT):
+        """Long-poll until predicate(self) holds; False if the timeout passes first"""
+        deadline = time.perf_counter() + timeout
+        while not predicate(self):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return False
+            self.poll(wait=remaining)
+        return True
+
+    def stream(self, until_seq, timeout=CHANGE_FEED_TIMEOUT):
+        """Apply server-sent events from /api/changes/stream until self.seq reaches until_seq"""
+        with requests.get(f"{API_BASE}/changes/stream", params={"since": self.seq},
+                          headers={"Accept": "text/event-stream"}, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            data = []
+            for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                if line is None:
+                    continue
+                self.bytes_received += len(line) + 1
+                if line.startswith("data:"):
+                    data.append(line[5:].strip())
+                elif not line and data:
+                    self.apply(json.loads("\n".join(data)))
+                    data = []
+                    if self.seq >= until_seq:
+                        return
+
+
+# Regression gate for the benchmark suite: slower by more than the threshold AND significant at alpha
+BENCHMARK_BASELINE = os.getenv('BENCHMARK_BASELINE', 'benchmark_baseline.json')
+REGRESSION_THRESHOLD = 0.20
+REGRESSION_ALPHA = 0.01
+
+
+class SchoolManagementTester:
+    def __init__(self, session=None, verbose=True, client="sync", max_connections=20, fanout="inline",
+                 id_prefix="STU", school_year="2024-2025", contract=False):
+        self.session = session or make_client(client, max_connections)
+        self.client_options = {"client": client, "max_connections": max_connections}
+        self.verbose = verbose
+        self.fanout_mode = fanout
+        # Also run the contract suites and checks, for endpoints and guarantees the backend does not provide yet
+        self.contract = contract
+        # Namespace of everything this tester creates: student_id prefix and class school_year
+        self.id_prefix = id_prefix
+        self.school_year = school_year
+        self.results_lock = threading.Lock()
         self.created_students = []
         self.created_classes = []
         self.created_assignments = []
+        self.single_grade_percentages = {}
+        self.verify_report_cache = True
+        self.dashboard_baseline = None
+        # Outcome of every named check, for comparing runs against different backends
+        self.outcomes = {}
         self.test_results = {
             'passed': 0,
             'failed': 0,
             'errors': []
         }
 
-    def log_result(self, test_name, success, message=""):
-        if success:
-            self.test_results['passed'] += 1
-            print(f"✅ {test_name}: PASSED {message}")
+    def iter_ndjson(self, url, params=None):
+        """Yield one decoded object per NDJSON line, streaming the body when the client allows it"""
+        if isinstance(self.session, requests.Session):
+            with self.session.get(url, params=params, stream=True) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if line:
+                        yield json.loads(line)
         else:
-            self.test_results['failed'] += 1
-            self.test_results['errors'].append(f"{test_name}: {message}")
-            print(f"❌ {test_name}: FAILED - {message}")
+            response = self.session.get(url, params=params)
+            response.raise_for_status()
+            for line in response.text.splitlines():
+                if line:
+                    yield json.loads(line)
+
+    def iter_csv(self, url, params=None):
+        """Yield one dict per CSV row, streaming the body when the client allows it"""
+        if isinstance(self.session, requests.Session):
+            with self.session.get(url, params=params, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                yield from csv.DictReader(io.TextIOWrapper(response.raw, encoding="utf-8", newline=""))
+        else:
+            response = self.session.get(url, params=params)
+            response.raise_for_status()
+            yield from csv.DictReader(io.StringIO(response.text, newline=""))
+
+    def iter_pages(self, path, params=None, page_size=100):
+        """Yield (items, payload_bytes, elapsed) for each keyset page of a list endpoint"""
+        params = dict(params or {}, limit=page_size)
+        while True:
+            start = time.perf_counter()
+            response = self.session.get(f"{API_BASE}/{path}", params=params)
+            elapsed = time.perf_counter() - start
+            response.raise_for_status()
+            items = response.json()
+            yield items, len(response.content), elapsed
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor or not items:
+                return
+            params["after"] = cursor
+
+    def fetch_all(self, path, params=None, page_size=500):
+        """Every item of a paginated list endpoint"""
+        return [item for items, _, _ in self.iter_pages(path, params, page_size) for item in items]
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def log_result(self, test_name, success, message=""):
+        with self.results_lock:
+            self.outcomes[test_name] = self.outcomes.get(test_name, True) and success
+            if success:
+                self.test_results['passed'] += 1
+                self.log(f"✅ {test_name}: PASSED {message}")
+            else:
+                self.test_results['failed'] += 1
+                self.test_results['errors'].append(f"{test_name}: {message}")
+                self.log(f"❌ {test_name}: FAILED - {message}")
+
+    def gather(self, calls):
+        """Run independent (method, url, kwargs) calls, concurrently when the backend supports it"""
+        if hasattr(self.session, 'gather'):
+            return self.session.gather(calls)
+        results = []
+        for method, url, kwargs in calls:
+            try:
+                results.append(self.session.request(method, url, **kwargs))
+            except Exception as e:
+                results.append(e)
+        return results
 
     def test_api_connection(self):
         """Test basic API connectivity"""
-        print("\n=== Testing API Connection ===")
+        self.log("\n=== Testing API Connection ===")
         try:
             response = self.session.get(f"{API_BASE}/")
             if response.status_code == 200:
@@ -58,7 +948,7 @@ class SchoolManagementTester:
 
     def test_dashboard_stats(self):
         """Test dashboard statistics API"""
-        print("\n=== Testing Dashboard Statistics ===")
+        self.log("\n=== Testing Dashboard Statistics ===")
         try:
             response = self.session.get(f"{API_BASE}/dashboard")
             if response.status_code == 200:
@@ -68,6 +958,7 @@ class SchoolManagementTester:
                 
                 missing_fields = [field for field in required_fields if field not in data]
                 if not missing_fields:
+                    self.dashboard_baseline = data
                     self.log_result("Dashboard Stats", True, f"All fields present: {data}")
                 else:
                     self.log_result("Dashboard Stats", False, f"Missing fields: {missing_fields}")
@@ -76,14 +967,118 @@ class SchoolManagementTester:
         except Exception as e:
             self.log_result("Dashboard Stats", False, f"Error: {str(e)}")
 
+    def poll_dashboard(self, predicate, timeout=DASHBOARD_REFRESH_TIMEOUT):
+        """Re-read the dashboard until predicate(data) holds or the refresh timeout passes"""
+        deadline = time.perf_counter() + timeout
+        while True:
+            data = self.session.get(f"{API_BASE}/dashboard").json()
+            if predicate(data) or time.perf_counter() >= deadline:
+                return data, predicate(data)
+            time.sleep(0.1)
+
+    def test_dashboard_updates(self):
+        """Test the stored dashboard figures follow the writes made by the other suites"""
+        self.log("\n=== Testing Dashboard Updates ===")
+        
+        base = self.dashboard_baseline
+        if base is None:
+            self.log_result("Dashboard Updates", False, "No dashboard baseline recorded")
+            return
+
+        def counters_caught_up(data):
+            return (data['total_students'] >= base['total_students'] + len(self.created_students)
+                    and data['total_classes'] >= base['total_classes'] + len(self.created_classes)
+                    and data['total_assignments'] >= base['total_assignments'] + len(self.created_assignments)
+                    and data['recent_grades_count'] > base['recent_grades_count'])
+
+        try:
+            data, ok = self.poll_dashboard(counters_caught_up)
+            if ok and 0 <= data['average_class_performance'] <= 100:
+                self.log_result("Dashboard Counters Updated", True, f"Before: {base}, after: {data}")
+            else:
+                self.log_result("Dashboard Counters Updated", False, f"Before: {base}, after: {data}")
+
+            # A single write must be reflected exactly, not just eventually grow the totals
+            before = data['total_students']
+            response = self.session.post(f"{API_BASE}/students", json={
+                "student_id": f"{self.id_prefix}DASH-{uuid.uuid4().hex[:8]}",
+                "first_name": "Noah",
+                "last_name": "Miller",
+                "email": "noah.miller@email.com",
+                "grade_level": "3",
+                "parent_name": "Laura Miller",
+                "parent_email": "laura.miller@email.com",
+                "parent_phone": "555-0104"
+            })
+            if response.status_code != 200:
+                self.log_result("Dashboard Single Write", False, f"Student create failed: {response.status_code}")
+                return
+            data, ok = self.poll_dashboard(lambda d: d['total_students'] == before + 1)
+            if ok:
+                self.log_result("Dashboard Single Write", True, f"total_students {before} -> {data['total_students']}")
+            else:
+                self.log_result("Dashboard Single Write", False, 
+                              f"Expected {before + 1} students, got {data['total_students']}")
+        except Exception as e:
+            self.log_result("Dashboard Updates", False, f"Error: {str(e)}")
+
+    def time_dashboard_reads(self, samples=20):
+        """Median latency in ms of repeated dashboard reads"""
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            self.session.get(f"{API_BASE}/dashboard")
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings) * 1000
+
+    def benchmark_dashboard_growth(self, growth_steps=(0, 200, 1000), samples=20, max_ratio=2.0, seed=42):
+        """Grow students, classes, assignments and grades and check dashboard read latency stays flat.
+
+        Each step loads one more generated dataset through the API (grades through /grades/batch, or
+        one at a time where the backend lacks it) into a namespace of its own, which is deleted afterwards.
+        """
+        self.log("\n=== Benchmarking Dashboard Read Cost ===")
+        token = uuid.uuid4().hex[:6].upper()
+        year = random.SystemRandom().randrange(2100, 9900)
+        bench = SchoolManagementTester(session=self.session, verbose=False, id_prefix=f"BENCH{token}",
+                                       school_year=f"{year}-{year + 1}")
+        created = {'students': 0, 'grades': 0}
+        medians = []
+        try:
+            for n, target in enumerate(growth_steps):
+                if target > created['students']:
+                    generator = DistrictDataGenerator(
+                        seed=seed + n, students_per_grade=math.ceil((target - created['students']) / len(GRADE_LEVELS)),
+                        teachers_per_grade=1, school_year=bench.school_year, id_prefix=f"{bench.id_prefix}-{n}")
+                    generator.load_through_api(self.session)
+                    counts = generator.expected_counts()
+                    created['students'] += counts['students']
+                    created['grades'] += counts['grades']
+                self.time_dashboard_reads(samples=3)  # warm-up
+                median = self.time_dashboard_reads(samples)
+                medians.append(median)
+                self.log(f"   +{created['students']} students, +{created['grades']} grades: "
+                         f"median dashboard read {median:.2f}ms")
+        except Exception as e:
+            self.log_result("Dashboard Read Cost Flat", False, f"Error: {str(e)}")
+            return medians
+        finally:
+            students, classes = bench.cleanup_namespace()
+            self.log(f"   Deleted {students} benchmark students and {classes} classes")
+
+        ratio = medians[-1] / medians[0] if medians[0] else float('inf')
+        self.log_result("Dashboard Read Cost Flat", ratio <= max_ratio, 
+                      f"{medians[0]:.2f}ms -> {medians[-1]:.2f}ms ({ratio:.2f}x, limit {max_ratio}x)")
+        return medians
+
     def test_student_management(self):
         """Test student CRUD operations"""
-        print("\n=== Testing Student Management ===")
+        self.log("\n=== Testing Student Management ===")
         
         # Test creating students
         test_students = [
             {
-                "student_id": "STU001",
+                "student_id": f"{self.id_prefix}001",
                 "first_name": "Emma",
                 "last_name": "Johnson",
                 "email": "emma.johnson@email.com",
@@ -93,7 +1088,7 @@ class SchoolManagementTester:
                 "parent_phone": "555-0101"
             },
             {
-                "student_id": "STU002", 
+                "student_id": f"{self.id_prefix}002", 
                 "first_name": "Liam",
                 "last_name": "Smith",
                 "email": "liam.smith@email.com",
@@ -103,7 +1098,7 @@ class SchoolManagementTester:
                 "parent_phone": "555-0102"
             },
             {
-                "student_id": "STU003",
+                "student_id": f"{self.id_prefix}003",
                 "first_name": "Olivia",
                 "last_name": "Brown",
                 "email": "olivia.brown@email.com", 
@@ -140,6 +1135,22 @@ class SchoolManagementTester:
             except Exception as e:
                 self.log_result("Duplicate Student ID Handling", False, f"Error: {str(e)}")
 
+        # Simultaneous creates of one new ID must be settled by the unique index, not a read-then-write check
+        if test_students and self.contract:
+            racing_student = dict(test_students[0], student_id=f"{self.id_prefix}RACE-{uuid.uuid4().hex[:8]}")
+            try:
+                with ThreadPoolExecutor(max_workers=8) as pool:
+                    statuses = list(pool.map(
+                        lambda _: self.session.post(f"{API_BASE}/students", json=racing_student).status_code,
+                        range(8)))
+                if statuses.count(200) == 1 and statuses.count(400) == len(statuses) - 1:
+                    self.log_result("Concurrent Duplicate Student ID", True, 
+                                  f"Exactly one of {len(statuses)} concurrent creates accepted")
+                else:
+                    self.log_result("Concurrent Duplicate Student ID", False, f"Statuses: {statuses}")
+            except Exception as e:
+                self.log_result("Concurrent Duplicate Student ID", False, f"Error: {str(e)}")
+
         # Test fetching students
         try:
             response = self.session.get(f"{API_BASE}/students")
@@ -154,9 +1165,243 @@ class SchoolManagementTester:
         except Exception as e:
             self.log_result("Fetch Students", False, f"Error: {str(e)}")
 
+    def test_pagination(self):
+        """Test keyset pagination, field projection and server-side filters on list endpoints"""
+        self.log("\n=== Testing Pagination, Projection and Filters ===")
+        
+        try:
+            page_size = 2
+            full_ids = [s['id'] for s in self.session.get(f"{API_BASE}/students").json()]
+            params = {"limit": page_size}
+            paged_ids = []
+            problems = []
+            # A backend that never stops handing out cursors must not spin forever
+            for page in range(len(full_ids) // page_size + 2):
+                response = self.session.get(f"{API_BASE}/students", params=params)
+                response.raise_for_status()
+                items = response.json()
+                if len(items) > page_size:
+                    problems.append(f"page {page + 1} has {len(items)} items")
+                paged_ids.extend(s['id'] for s in items)
+                cursor = response.headers.get("X-Next-Cursor")
+                if not cursor or not items:
+                    break
+                params["after"] = cursor
+            else:
+                problems.append(f"still handing out cursors after {len(paged_ids)} ids")
+            if len(full_ids) > page_size and len(paged_ids) < len(full_ids) and not cursor:
+                problems.append(f"no X-Next-Cursor after {len(paged_ids)} of {len(full_ids)} students")
+            if not problems and len(paged_ids) == len(set(paged_ids)) and set(paged_ids) == set(full_ids):
+                self.log_result("Paginate Students", True, f"{len(paged_ids)} students across pages of {page_size}")
+            else:
+                self.log_result("Paginate Students", False, 
+                              "; ".join(problems) or f"Paged {len(paged_ids)} ids ({len(set(paged_ids))} unique), "
+                                                      f"full fetch {len(full_ids)}")
+        except Exception as e:
+            self.log_result("Paginate Students", False, f"Error: {str(e)}")
+
+        try:
+            requested = {"student_id", "grade_level"}
+            response = self.session.get(f"{API_BASE}/students",
+                                        params={"fields": ",".join(sorted(requested)), "limit": 50})
+            if response.status_code == 200:
+                students = response.json()
+                extra = {key for s in students for key in s} - requested - {"id"}
+                if students and not extra and all("student_id" in s for s in students):
+                    self.log_result("Student Field Projection", True, f"Only {sorted(requested | {'id'})} returned")
+                else:
+                    self.log_result("Student Field Projection", False, f"Unexpected fields: {sorted(extra)}")
+            else:
+                self.log_result("Student Field Projection", False, f"Status code: {response.status_code}")
+        except Exception as e:
+            self.log_result("Student Field Projection", False, f"Error: {str(e)}")
+
+        if self.created_students:
+            grade_level = self.created_students[0]["grade_level"]
+            try:
+                students = self.fetch_all("students", {"grade_level": grade_level}, page_size=2)
+                expected_ids = {s['id'] for s in self.created_students if s['grade_level'] == grade_level}
+                if all(s['grade_level'] == grade_level for s in students) and \
+                        expected_ids <= {s['id'] for s in students}:
+                    self.log_result("Filter Students by Grade Level", True, 
+                                  f"{len(students)} students in grade {grade_level}")
+                else:
+                    self.log_result("Filter Students by Grade Level", False, 
+                                  f"Filter returned {[(s['student_id'], s['grade_level']) for s in students]}")
+            except Exception as e:
+                self.log_result("Filter Students by Grade Level", False, f"Error: {str(e)}")
+
+        if self.created_classes:
+            class_obj = self.created_classes[-1]
+            filters = {"grade_level": class_obj["grade_level"], "school_year": class_obj["school_year"]}
+            try:
+                classes = self.fetch_all("classes", filters, page_size=2)
+                if all(c['grade_level'] == filters['grade_level'] and c['school_year'] == filters['school_year']
+                       for c in classes) and class_obj['id'] in {c['id'] for c in classes}:
+                    self.log_result("Filter Classes", True, f"{len(classes)} classes matching {filters}")
+                else:
+                    self.log_result("Filter Classes", False, f"Filter {filters} returned {classes}")
+            except Exception as e:
+                self.log_result("Filter Classes", False, f"Error: {str(e)}")
+
+    def benchmark_pagination(self, min_rows=2000, page_size=100, max_ratio=2.0, seed=42):
+        """Page through a large students collection and check per-page size and latency stay constant.
+
+        Students missing from min_rows are generated into a namespace of their own, deleted afterwards.
+        """
+        self.log("\n=== Benchmarking Paginated Student Listing ===")
+        year = random.SystemRandom().randrange(2100, 9900)
+        bench = SchoolManagementTester(session=self.session, verbose=False,
+                                       id_prefix=f"PAGE{uuid.uuid4().hex[:6].upper()}",
+                                       school_year=f"{year}-{year + 1}")
+        try:
+            existing = sum(len(items) for items, _, _ in self.iter_pages("students", {"fields": "id"}, 1000))
+            if existing < min_rows:
+                DistrictDataGenerator(
+                    seed=seed, students_per_grade=math.ceil((min_rows - existing) / len(GRADE_LEVELS)),
+                    teachers_per_grade=0, school_year=bench.school_year, id_prefix=bench.id_prefix,
+                ).load_through_api(self.session)
+            pages = [(size, elapsed) for items, size, elapsed in self.iter_pages("students", page_size=page_size)
+                     if len(items) == page_size]
+        except Exception as e:
+            self.log_result("Pagination Cost Constant", False, f"Error: {str(e)}")
+            return []
+        finally:
+            students, _ = bench.cleanup_namespace()
+            self.log(f"   Deleted {students} benchmark students")
+
+        if len(pages) < 4:
+            self.log_result("Pagination Cost Constant", False, f"Only {len(pages)} full pages to compare")
+            return pages
+        quarter = len(pages) // 4
+        first_latency = statistics.median(elapsed for _, elapsed in pages[:quarter])
+        last_latency = statistics.median(elapsed for _, elapsed in pages[-quarter:])
+        sizes = [size for size, _ in pages]
+        latency_ratio = last_latency / first_latency if first_latency else float('inf')
+        size_ratio = max(sizes) / min(sizes)
+        self.log_result("Pagination Cost Constant", latency_ratio <= max_ratio and size_ratio <= max_ratio, 
+                      f"{len(pages)} pages of {page_size}: latency {first_latency * 1000:.2f}ms -> "
+                      f"{last_latency * 1000:.2f}ms ({latency_ratio:.2f}x), "
+                      f"payload {min(sizes)}-{max(sizes)} bytes ({size_ratio:.2f}x)")
+        return pages
+
+    def import_roster(self, rows, fmt="csv"):
+        """POST a roster to /api/students/import, streaming the body when the client allows it"""
+        body = encode_roster(rows, fmt)
+        if not isinstance(self.session, requests.Session):
+            body = b"".join(body)
+        content_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+        return self.session.post(f"{API_BASE}/students/import", params={"format": fmt}, data=body,
+                                 headers={"Content-Type": content_type})
+
+    def imported_students(self, prefix):
+        """Students whose student_id starts with prefix, keyed by student_id"""
+        return {student["student_id"]: student for student in self.fetch_all("students")
+                if student["student_id"].startswith(prefix)}
+
+    def test_bulk_import(self):
+        """Test roster import reports bad rows and stores the good ones like POST /api/students"""
+        self.log("\n=== Testing Bulk Roster Import ===")
+
+        for fmt in ("csv", "ndjson"):
+            prefix = f"{self.id_prefix}IMP{uuid.uuid4().hex[:6].upper()}"
+            rows = roster_rows(5, id_prefix=prefix)
+            bad_rows = [dict(rows[1])]
+            expected_errors = {len(rows) + 1: rows[1]["student_id"]}
+            if self.created_students:
+                existing = dict(rows[2], student_id=self.created_students[0]["student_id"])
+                bad_rows.append(existing)
+                expected_errors[len(rows) + len(bad_rows)] = existing["student_id"]
+            bad_rows.append(dict(rows[3], student_id=f"{prefix}-NONAME", first_name=None))
+            expected_errors[len(rows) + len(bad_rows)] = f"{prefix}-NONAME"
+
+            try:
+                response = self.import_roster(rows + bad_rows, fmt)
+                if response.status_code != 200:
+                    self.log_result(f"Bulk Import {fmt}", False, 
+                                  f"Status: {response.status_code}, Response: {response.text}")
+                    continue
+                report = response.json()
+                reported = {error["row"]: error.get("student_id") for error in report["errors"]}
+                stored = self.imported_students(prefix)
+                wrong = [row for row in rows
+                         if {field: stored.get(row["student_id"], {}).get(field) for field in ROSTER_FIELDS} != row]
+                if (report["imported"] == len(rows) and report["rejected"] == len(bad_rows)
+                        and reported == expected_errors and not wrong and len(stored) == len(rows)):
+                    self.log_result(f"Bulk Import {fmt}", True, 
+                                  f"Imported {report['imported']}, rejected rows {sorted(reported)}: "
+                                  + "; ".join(error["error"] for error in report["errors"]))
+                else:
+                    self.log_result(f"Bulk Import {fmt}", False, 
+                                  f"Report {report}, expected errors at {expected_errors}, "
+                                  f"{len(stored)} stored, mismatched rows {[row['student_id'] for row in wrong]}")
+            except Exception as e:
+                self.log_result(f"Bulk Import {fmt}", False, f"Error: {str(e)}")
+
+    def benchmark_bulk_import(self, rows=50000, sample=500, fmt="csv", seed=42):
+        """Import a large roster and compare it with creating students one request at a time.
+
+        Every student of the run's IMP prefix is deleted when the benchmark ends.
+        """
+        self.log(f"\n=== Benchmarking Bulk Roster Import ({rows} rows, {fmt}) ===")
+        prefix = f"IMP{uuid.uuid4().hex[:6].upper()}"
+        roster = roster_rows(rows, seed=seed, id_prefix=prefix)
+        sample = min(sample, rows // 2)
+
+        try:
+            start = time.perf_counter()
+            failures = [response.text for response in
+                        (self.session.post(f"{API_BASE}/students", json=row) for row in roster[:sample])
+                        if response.status_code != 200]
+            single_rate = sample / (time.perf_counter() - start)
+            self.log_result("One-at-a-time Import", not failures, 
+                          f"{sample} rows at {single_rate:.0f} rows/s" + (f", failures: {failures[:3]}" if failures else ""))
+
+            start = time.perf_counter()
+            response = self.import_roster(roster[sample:], fmt)
+            bulk_rate = (rows - sample) / (time.perf_counter() - start)
+            if response.status_code != 200:
+                self.log_result("Bulk Import Throughput", False, 
+                              f"Status: {response.status_code}, Response: {response.text[:500]}")
+                return
+            report = response.json()
+            self.log_result("Bulk Import Throughput", report["imported"] == rows - sample and bulk_rate > single_rate, 
+                          f"{report['imported']} rows at {bulk_rate:.0f} rows/s "
+                          f"({bulk_rate / single_rate:.1f}x one-at-a-time), {report['rejected']} rejected")
+
+            # Both paths must store the same documents
+            stored = self.imported_students(prefix)
+            single_keys = {frozenset(stored[row["student_id"]]) for row in roster[:sample] if row["student_id"] in stored}
+            bulk_keys = {frozenset(stored[row["student_id"]]) for row in roster[sample:] if row["student_id"] in stored}
+            wrong = [row["student_id"] for row in roster
+                     if {field: stored.get(row["student_id"], {}).get(field) for field in ROSTER_FIELDS} != row]
+            self.log_result("Bulk Import Correctness", not wrong and single_keys == bulk_keys, 
+                          f"{len(stored)}/{rows} rows stored, {len(wrong)} mismatched, "
+                          f"document fields {'match' if single_keys == bulk_keys else 'differ'} across paths")
+
+            # Re-importing stored rows must reject every one of them
+            start = time.perf_counter()
+            report = self.import_roster(roster[:sample], fmt).json()
+            self.log_result("Bulk Import Duplicates", report["imported"] == 0 and report["rejected"] == sample, 
+                          f"{report['rejected']}/{sample} existing rows rejected in "
+                          f"{(time.perf_counter() - start) * 1000:.0f}ms")
+        finally:
+            # Up to --import-rows students, so fetch only ids and delete in parallel
+            students = [s["id"] for s in self.fetch_all("students", {"fields": "id,student_id"})
+                        if s["student_id"].startswith(prefix)]
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                statuses = list(pool.map(
+                    lambda sid: self.session.delete(f"{API_BASE}/students/{sid}").status_code, students))
+            failed = [status for status in statuses if status not in (200, 204, 404)]
+            if failed:
+                self.log_result("Bulk Import Cleanup", False, 
+                              f"{len(failed)} of {len(students)} student deletes failed: {failed[:5]}")
+            else:
+                self.log(f"   Deleted {len(students)} imported students")
+
     def test_class_management(self):
         """Test class creation with automatic grade categories"""
-        print("\n=== Testing Class Management ===")
+        self.log("\n=== Testing Class Management ===")
         
         test_classes = [
             {
@@ -164,67 +1409,46 @@ class SchoolManagementTester:
                 "subject": "Mathematics", 
                 "teacher_name": "Mrs. Anderson",
                 "grade_level": "K",
-                "school_year": "2024-2025"
+                "school_year": self.school_year
             },
             {
                 "name": "First Grade Reading",
                 "subject": "English Language Arts",
                 "teacher_name": "Mr. Wilson", 
                 "grade_level": "1",
-                "school_year": "2024-2025"
+                "school_year": self.school_year
             },
             {
                 "name": "Second Grade Science",
                 "subject": "Science",
                 "teacher_name": "Ms. Davis",
                 "grade_level": "2", 
-                "school_year": "2024-2025"
+                "school_year": self.school_year
             }
         ]
 
+        new_classes = []
         for class_data in test_classes:
             try:
                 response = self.session.post(f"{API_BASE}/classes", json=class_data)
                 if response.status_code == 200:
                     class_obj = response.json()
                     self.created_classes.append(class_obj)
+                    new_classes.append(class_obj)
                     self.log_result(f"Create Class {class_data['name']}", True, 
                                   f"Created with ID: {class_obj['id']}")
-                    
-                    # Test automatic grade category creation
-                    try:
-                        cat_response = self.session.get(f"{API_BASE}/classes/{class_obj['id']}/categories")
-                        if cat_response.status_code == 200:
-                            categories = cat_response.json()
-                            expected_categories = ["Homework", "Tests", "Projects"]
-                            category_names = [cat['name'] for cat in categories]
-                            
-                            if all(cat in category_names for cat in expected_categories):
-                                # Check weights
-                                weights = {cat['name']: cat['weight_percentage'] for cat in categories}
-                                expected_weights = {"Homework": 30.0, "Tests": 50.0, "Projects": 20.0}
-                                
-                                if weights == expected_weights:
-                                    self.log_result(f"Auto Grade Categories {class_data['name']}", True, 
-                                                  f"Correct categories and weights: {weights}")
-                                else:
-                                    self.log_result(f"Auto Grade Categories {class_data['name']}", False, 
-                                                  f"Wrong weights. Expected: {expected_weights}, Got: {weights}")
-                            else:
-                                self.log_result(f"Auto Grade Categories {class_data['name']}", False, 
-                                              f"Missing categories. Expected: {expected_categories}, Got: {category_names}")
-                        else:
-                            self.log_result(f"Auto Grade Categories {class_data['name']}", False, 
-                                          f"Failed to fetch categories: {cat_response.status_code}")
-                    except Exception as e:
-                        self.log_result(f"Auto Grade Categories {class_data['name']}", False, f"Error: {str(e)}")
-                        
                 else:
                     self.log_result(f"Create Class {class_data['name']}", False, 
                                   f"Status: {response.status_code}, Response: {response.text}")
             except Exception as e:
                 self.log_result(f"Create Class {class_data['name']}", False, f"Error: {str(e)}")
 
+        # Test automatic grade category creation (independent per class, so fetched concurrently)
+        cat_responses = self.gather([("GET", f"{API_BASE}/classes/{class_obj['id']}/categories", {})
+                                     for class_obj in new_classes])
+        for class_obj, cat_response in zip(new_classes, cat_responses):
+            self.check_class_categories(class_obj, cat_response)
+
         # Test fetching classes
         try:
             response = self.session.get(f"{API_BASE}/classes")
@@ -239,9 +1463,75 @@ class SchoolManagementTester:
         except Exception as e:
             self.log_result("Fetch Classes", False, f"Error: {str(e)}")
 
+    def check_class_categories(self, class_obj, cat_response):
+        """Verify the Homework/Tests/Projects categories auto-created for a class"""
+        test_name = f"Auto Grade Categories {class_obj['name']}"
+        if isinstance(cat_response, Exception):
+            self.log_result(test_name, False, f"Error: {str(cat_response)}")
+            return
+        try:
+            if cat_response.status_code == 200:
+                categories = cat_response.json()
+                expected_categories = ["Homework", "Tests", "Projects"]
+                category_names = [cat['name'] for cat in categories]
+                
+                if all(cat in category_names for cat in expected_categories):
+                    # Check weights
+                    weights = {cat['name']: cat['weight_percentage'] for cat in categories}
+                    expected_weights = {"Homework": 30.0, "Tests": 50.0, "Projects": 20.0}
+                    
+                    if weights == expected_weights:
+                        self.log_result(test_name, True, f"Correct categories and weights: {weights}")
+                    else:
+                        self.log_result(test_name, False, 
+                                      f"Wrong weights. Expected: {expected_weights}, Got: {weights}")
+                else:
+                    self.log_result(test_name, False, 
+                                  f"Missing categories. Expected: {expected_categories}, Got: {category_names}")
+            else:
+                self.log_result(test_name, False, f"Failed to fetch categories: {cat_response.status_code}")
+        except Exception as e:
+            self.log_result(test_name, False, f"Error: {str(e)}")
+
+    def fanout_params(self):
+        return {"fanout": "background"} if self.fanout_mode == "background" else None
+
+    def create_assignment(self, assignment_data):
+        """POST an assignment and wait for its grade-record fan-out job, if the server ran one"""
+        response = self.session.post(f"{API_BASE}/assignments", json=assignment_data,
+                                     params=self.fanout_params())
+        if response.status_code == 200:
+            self.wait_for_fanout(response.json())
+        return response
+
+    def wait_for_fanout(self, assignment, timeout=FANOUT_TIMEOUT):
+        """Poll the assignment's fan-out job until it finishes; inline fan-outs return immediately"""
+        job_id = assignment.get("fanout_job_id")
+        if not job_id:
+            return None
+        test_name = f"Grade Fan-out {assignment['name']}"
+        start = time.perf_counter()
+        job = {}
+        try:
+            while time.perf_counter() - start < timeout:
+                job = self.session.get(f"{API_BASE}/jobs/{job_id}").json()
+                if job.get("status") in ("completed", "failed"):
+                    break
+                time.sleep(0.05)
+        except Exception as e:
+            self.log_result(test_name, False, f"Error: {str(e)}")
+            return None
+        elapsed = time.perf_counter() - start
+        if job.get("status") == "completed":
+            self.log_result(test_name, True, 
+                          f"{job.get('created', 0)} grade records after {elapsed * 1000:.1f}ms")
+        else:
+            self.log_result(test_name, False, f"Job {job_id} not completed after {elapsed:.1f}s: {job}")
+        return job
+
     def test_assignment_creation(self):
         """Test assignment creation with automatic grade record creation"""
-        print("\n=== Testing Assignment Creation ===")
+        self.log("\n=== Testing Assignment Creation ===")
         
         if not self.created_classes:
             self.log_result("Assignment Creation", False, "No classes available for testing")
@@ -271,18 +1561,24 @@ class SchoolManagementTester:
             }
         ]
 
+        pending_checks = []
         for i, assignment_data in enumerate(test_assignments):
             if i < len(self.created_classes):
                 class_obj = self.created_classes[i]
                 assignment_data["class_id"] = class_obj["id"]
                 
                 try:
-                    response = self.session.post(f"{API_BASE}/assignments", json=assignment_data)
+                    start = time.perf_counter()
+                    response = self.session.post(f"{API_BASE}/assignments", json=assignment_data,
+                                                 params=self.fanout_params())
+                    elapsed = time.perf_counter() - start
                     if response.status_code == 200:
                         assignment = response.json()
                         self.created_assignments.append(assignment)
                         self.log_result(f"Create Assignment {assignment_data['name']}", True, 
-                                      f"Created with ID: {assignment['id']}")
+                                      f"Created with ID: {assignment['id']} in {elapsed * 1000:.1f}ms")
+                        # Background fan-out must finish before the grade records are checked
+                        self.wait_for_fanout(assignment)
                         
                         # Test automatic grade record creation
                         # Get students in the same grade level as this class
@@ -291,24 +1587,7 @@ class SchoolManagementTester:
                         
                         if students_in_grade:
                             # Check if grade records were created for these students
-                            student_id = students_in_grade[0]["id"]
-                            try:
-                                grades_response = self.session.get(f"{API_BASE}/students/{student_id}/grades")
-                                if grades_response.status_code == 200:
-                                    grades = grades_response.json()
-                                    assignment_grades = [g for g in grades if g["assignment_id"] == assignment["id"]]
-                                    
-                                    if assignment_grades:
-                                        self.log_result(f"Auto Grade Records {assignment_data['name']}", True, 
-                                                      f"Grade records created for students")
-                                    else:
-                                        self.log_result(f"Auto Grade Records {assignment_data['name']}", False, 
-                                                      f"No grade records found for assignment")
-                                else:
-                                    self.log_result(f"Auto Grade Records {assignment_data['name']}", False, 
-                                                  f"Failed to fetch student grades: {grades_response.status_code}")
-                            except Exception as e:
-                                self.log_result(f"Auto Grade Records {assignment_data['name']}", False, f"Error: {str(e)}")
+                            pending_checks.append((assignment_data, assignment, students_in_grade[0]["id"]))
                         
                     else:
                         self.log_result(f"Create Assignment {assignment_data['name']}", False, 
@@ -316,9 +1595,90 @@ class SchoolManagementTester:
                 except Exception as e:
                     self.log_result(f"Create Assignment {assignment_data['name']}", False, f"Error: {str(e)}")
 
+        # Grade-record checks are independent per assignment, so fetch them concurrently
+        grades_responses = self.gather([("GET", f"{API_BASE}/students/{student_id}/grades", {})
+                                        for _, _, student_id in pending_checks])
+        for (assignment_data, assignment, _), grades_response in zip(pending_checks, grades_responses):
+            self.check_grade_records(assignment_data, assignment, grades_response)
+
+    def test_fanout_latency(self, grade_level="12", samples=3):
+        """Test creating an assignment for a large grade level stays fast when the fan-out runs in the background"""
+        self.log("\n=== Testing Assignment Fan-out Latency ===")
+
+        prefix = f"{self.id_prefix}FAN{uuid.uuid4().hex[:6].upper()}"
+        rows = [dict(row, grade_level=grade_level) for row in roster_rows(FANOUT_STUDENTS, id_prefix=prefix)]
+        class_obj = None
+        assignments = []
+        try:
+            self.import_roster(rows).raise_for_status()
+            response = self.session.post(f"{API_BASE}/classes", json={
+                "name": "Fan-out Probe Class",
+                "subject": "Mathematics",
+                "teacher_name": "Mr. Probe",
+                "grade_level": grade_level,
+                "school_year": self.school_year
+            })
+            response.raise_for_status()
+            class_obj = response.json()
+
+            timings = {"background": [], "inline": []}
+            jobs = []
+            for mode in ("background", "inline"):
+                for n in range(samples):
+                    start = time.perf_counter()
+                    response = self.session.post(f"{API_BASE}/assignments", params={"fanout": mode}, json={
+                        "class_id": class_obj["id"],
+                        "name": f"Fan-out Probe {mode} {n + 1}",
+                        "category": "Homework",
+                        "points_possible": 10.0
+                    })
+                    timings[mode].append(time.perf_counter() - start)
+                    response.raise_for_status()
+                    assignments.append(response.json())
+                    if mode == "background":
+                        jobs.append(self.wait_for_fanout(assignments[-1]) or {})
+            background = statistics.median(timings["background"]) * 1000
+            inline = statistics.median(timings["inline"]) * 1000
+            fanned_out = [job.get("created", 0) for job in jobs]
+            message = (f"median POST {background:.1f}ms in the background vs {inline:.1f}ms inline for "
+                       f"{FANOUT_STUDENTS} students (limit {FANOUT_POST_LIMIT_MS:.0f}ms); records per job {fanned_out}")
+            self.log_result("Assignment Fan-out Latency", 
+                          background <= FANOUT_POST_LIMIT_MS and min(fanned_out) >= FANOUT_STUDENTS, message)
+        except Exception as e:
+            self.log_result("Assignment Fan-out Latency", False, f"Error: {str(e)}")
+        finally:
+            students = list(self.imported_students(prefix).values())
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda path: self.session.delete(f"{API_BASE}/{path}"),
+                              [f"assignments/{a['id']}" for a in assignments]))
+                list(pool.map(lambda path: self.session.delete(f"{API_BASE}/{path}"),
+                              ([f"classes/{class_obj['id']}"] if class_obj else [])
+                              + [f"students/{s['id']}" for s in students]))
+
+    def check_grade_records(self, assignment_data, assignment, grades_response):
+        """Verify a grade record was auto-created for the assignment"""
+        test_name = f"Auto Grade Records {assignment_data['name']}"
+        if isinstance(grades_response, Exception):
+            self.log_result(test_name, False, f"Error: {str(grades_response)}")
+            return
+        try:
+            if grades_response.status_code == 200:
+                grades = grades_response.json()
+                assignment_grades = [g for g in grades if g["assignment_id"] == assignment["id"]]
+                
+                if assignment_grades:
+                    self.log_result(test_name, True, f"Grade records created for students")
+                else:
+                    self.log_result(test_name, False, f"No grade records found for assignment")
+            else:
+                self.log_result(test_name, False, 
+                              f"Failed to fetch student grades: {grades_response.status_code}")
+        except Exception as e:
+            self.log_result(test_name, False, f"Error: {str(e)}")
+
     def test_grade_entry(self):
         """Test grade entry and percentage calculations"""
-        print("\n=== Testing Grade Entry and Calculations ===")
+        self.log("\n=== Testing Grade Entry and Calculations ===")
         
         if not self.created_assignments or not self.created_students:
             self.log_result("Grade Entry", False, "No assignments or students available for testing")
@@ -349,6 +1709,7 @@ class SchoolManagementTester:
                     if response.status_code == 200:
                         grade = response.json()
                         calculated_percentage = grade.get("percentage")
+                        self.single_grade_percentages[(student["id"], assignment["id"])] = calculated_percentage
                         
                         if calculated_percentage == grade_data["expected_percentage"]:
                             self.log_result(f"Grade Calculation {assignment['name']}", True, 
@@ -373,7 +1734,7 @@ class SchoolManagementTester:
             }
             
             try:
-                response = self.session.post(f"{API_BASE}/assignments", json=zero_points_assignment)
+                response = self.create_assignment(zero_points_assignment)
                 if response.status_code == 200:
                     assignment = response.json()
                     
@@ -398,17 +1759,133 @@ class SchoolManagementTester:
             except Exception as e:
                 self.log_result("Zero Points Assignment", False, f"Error: {str(e)}")
 
-    def test_progress_reports(self):
-        """Test progress report generation with weighted calculations"""
-        print("\n=== Testing Progress Reports ===")
+    def test_batch_grade_entry(self):
+        """Test bulk grade upserts match single-grade percentages and measure the speedup"""
+        self.log("\n=== Testing Batch Grade Entry ===")
         
-        if not self.created_students or not self.created_classes:
-            self.log_result("Progress Reports", False, "No students or classes available for testing")
+        if not self.created_assignments or not self.created_students:
+            self.log_result("Batch Grade Entry", False, "No assignments or students available for testing")
             return
 
-        # Test progress report for first student in first class
-        student = self.created_students[0]
-        class_obj = self.created_classes[0]
+        # Same student/assignment pairs and points as test_grade_entry
+        test_grades = [
+            {"points_earned": 18.0, "expected_percentage": 90.0},  # 18/20 = 90%
+            {"points_earned": 85.0, "expected_percentage": 85.0},  # 85/100 = 85%
+            {"points_earned": 45.0, "expected_percentage": 90.0},  # 45/50 = 90%
+        ]
+        batch_payload = []
+        expected = []
+        for i, grade_data in enumerate(test_grades):
+            if i < len(self.created_assignments) and i < len(self.created_students):
+                student = self.created_students[i]
+                assignment = self.created_assignments[i]
+                batch_payload.append({
+                    "student_id": student["id"],
+                    "assignment_id": assignment["id"],
+                    "points_earned": grade_data["points_earned"],
+                    "is_submitted": True,
+                    "submission_date": "2024-12-15"
+                })
+                single = self.single_grade_percentages.get((student["id"], assignment["id"]),
+                                                           grade_data["expected_percentage"])
+                expected.append((assignment["name"], grade_data["expected_percentage"], single))
+
+        try:
+            response = self.session.post(f"{API_BASE}/grades/batch", json=batch_payload)
+            if response.status_code == 200:
+                grades = response.json()
+                if len(grades) != len(batch_payload):
+                    self.log_result("Batch Grade Entry", False, 
+                                  f"Expected {len(batch_payload)} results, got {len(grades)}")
+                    return
+                for grade, (name, expected_percentage, single) in zip(grades, expected):
+                    calculated_percentage = grade.get("percentage")
+                    if calculated_percentage == expected_percentage == single:
+                        self.log_result(f"Batch Grade Calculation {name}", True, 
+                                      f"Matches single-grade path: {calculated_percentage}%")
+                    else:
+                        self.log_result(f"Batch Grade Calculation {name}", False, 
+                                      f"Expected {expected_percentage}% (single path {single}%), got {calculated_percentage}%")
+            else:
+                self.log_result("Batch Grade Entry", False, 
+                              f"Status: {response.status_code}, Response: {response.text}")
+                return
+        except Exception as e:
+            self.log_result("Batch Grade Entry", False, f"Error: {str(e)}")
+            return
+
+        # A whole class's scores for each assignment, done one by one vs. in one batch
+        class_levels = {class_obj["id"]: class_obj["grade_level"] for class_obj in self.created_classes}
+        writes = [{
+            "student_id": student["id"],
+            "assignment_id": assignment["id"],
+            "points_earned": assignment["points_possible"] * 0.8,
+            "is_submitted": True,
+            "submission_date": "2024-12-16"
+        } for assignment in self.created_assignments for student in self.created_students
+            if student["grade_level"] == class_levels.get(assignment["class_id"])]
+        try:
+            start = time.perf_counter()
+            for payload in writes:
+                self.session.post(f"{API_BASE}/grades", json=payload)
+            single_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            response = self.session.post(f"{API_BASE}/grades/batch", json=writes)
+            batch_elapsed = time.perf_counter() - start
+
+            if response.status_code == 200 and len(response.json()) == len(writes):
+                speedup = single_elapsed / batch_elapsed if batch_elapsed else float('inf')
+                self.log_result("Batch vs Single Grade Entry", True, 
+                              f"{len(writes)} writes: single {single_elapsed * 1000:.1f}ms, "
+                              f"batch {batch_elapsed * 1000:.1f}ms ({speedup:.1f}x faster)")
+            else:
+                self.log_result("Batch vs Single Grade Entry", False, 
+                              f"Status: {response.status_code}, Response: {response.text}")
+        except Exception as e:
+            self.log_result("Batch vs Single Grade Entry", False, f"Error: {str(e)}")
+
+    def upsert_fixture_grades(self):
+        """Re-score every enrolled student on every assignment; the load test's repeated grade writes"""
+        class_levels = {class_obj["id"]: class_obj["grade_level"] for class_obj in self.created_classes}
+        for assignment in self.created_assignments:
+            possible = assignment["points_possible"]
+            for student in self.created_students:
+                if student["grade_level"] != class_levels.get(assignment["class_id"]):
+                    continue
+                points_earned = round(random.uniform(0, possible), 1)
+                expected = round(points_earned / possible * 100, 2) if possible > 0 else 0.0
+                try:
+                    response = self.session.post(f"{API_BASE}/grades", json={
+                        "student_id": student["id"],
+                        "assignment_id": assignment["id"],
+                        "points_earned": points_earned,
+                        "is_submitted": True,
+                        "submission_date": "2024-12-18"
+                    })
+                    if response.status_code != 200:
+                        self.log_result("Grade Upsert", False, 
+                                      f"Status: {response.status_code}, Response: {response.text}")
+                    elif abs(response.json().get("percentage", -1) - expected) > 0.01:
+                        self.log_result("Grade Upsert", False, 
+                                      f"{points_earned}/{possible}: expected {expected}%, "
+                                      f"got {response.json().get('percentage')}%")
+                    else:
+                        self.log_result("Grade Upsert", True, f"{points_earned}/{possible} = {expected}%")
+                except Exception as e:
+                    self.log_result("Grade Upsert", False, f"Error: {str(e)}")
+
+    def test_progress_reports(self):
+        """Test progress report generation with weighted calculations"""
+        self.log("\n=== Testing Progress Reports ===")
+        
+        if not self.created_students or not self.created_classes:
+            self.log_result("Progress Reports", False, "No students or classes available for testing")
+            return
+
+        # Test progress report for first student in first class
+        student = self.created_students[0]
+        class_obj = self.created_classes[0]
         
         try:
             response = self.session.get(f"{API_BASE}/students/{student['id']}/progress/{class_obj['id']}")
@@ -446,12 +1923,12 @@ class SchoolManagementTester:
                                       f"Expected dict, got {type(category_grades)}")
                     
                     # Log the full report for verification
-                    print(f"📊 Progress Report Sample:")
-                    print(f"   Student: {report['student_name']}")
-                    print(f"   Class: {report['class_name']}")
-                    print(f"   Overall: {report['overall_percentage']}% ({report['letter_grade']})")
-                    print(f"   Categories: {report['category_grades']}")
-                    print(f"   Assignments: {report['completed_assignments']}/{report['total_assignments']} completed")
+                    self.log(f"📊 Progress Report Sample:")
+                    self.log(f"   Student: {report['student_name']}")
+                    self.log(f"   Class: {report['class_name']}")
+                    self.log(f"   Overall: {report['overall_percentage']}% ({report['letter_grade']})")
+                    self.log(f"   Categories: {report['category_grades']}")
+                    self.log(f"   Assignments: {report['completed_assignments']}/{report['total_assignments']} completed")
                     
                 else:
                     self.log_result("Progress Report Structure", False, f"Missing fields: {missing_fields}")
@@ -460,6 +1937,1095 @@ class SchoolManagementTester:
         except Exception as e:
             self.log_result("Progress Reports", False, f"Error: {str(e)}")
 
+        # Stored reports and the refresh parameter are not in the backend yet; without them this cannot fail
+        if self.verify_report_cache and self.contract:
+            self.check_progress_report_cache(student, class_obj)
+
+    def check_progress_report_cache(self, student, class_obj):
+        """Edit grades/assignments and check the cached report always equals a fresh recomputation"""
+        progress_url = f"{API_BASE}/students/{student['id']}/progress/{class_obj['id']}"
+        class_assignments = [a for a in self.created_assignments if a["class_id"] == class_obj["id"]]
+        if not class_assignments:
+            self.log_result("Progress Report Cache", False, "No assignments in class for grade edits")
+            return
+        assignment = class_assignments[0]
+        points_possible = assignment["points_possible"]
+
+        def grade_edit(points_earned, is_submitted=True):
+            return lambda: self.session.post(f"{API_BASE}/grades", json={
+                "student_id": student["id"],
+                "assignment_id": assignment["id"],
+                "points_earned": points_earned,
+                "is_submitted": is_submitted,
+                "submission_date": "2024-12-17"
+            })
+
+        added = []
+
+        def new_assignment():
+            response = self.create_assignment({
+                "class_id": class_obj["id"],
+                "name": "Unit Quiz",
+                "description": "Added mid-term to change the assignment counts",
+                "category": "Tests",
+                "points_possible": 10.0,
+                "due_date": "2024-12-23"
+            })
+            if response.status_code == 200:
+                added.append(response.json()["id"])
+            return response
+
+        edits = [
+            ("grade 50%", grade_edit(points_possible * 0.5)),
+            ("grade 100%", grade_edit(points_possible)),
+            ("unsubmitted", grade_edit(None, is_submitted=False)),
+            ("new assignment", new_assignment),
+            ("grade 0%", grade_edit(0.0)),
+            ("restore 90%", grade_edit(points_possible * 0.9)),
+        ]
+        mismatches = []
+        try:
+            for label, edit in edits:
+                edit_response = edit()
+                if edit_response.status_code != 200:
+                    self.log_result("Progress Report Cache", False, 
+                                  f"Edit '{label}' failed: {edit_response.status_code}")
+                    return
+                cached = self.session.get(progress_url)
+                fresh = self.session.get(progress_url, params={"refresh": "true"})
+                if cached.status_code != 200 or fresh.status_code != 200:
+                    mismatches.append(f"{label}: status {cached.status_code}/{fresh.status_code}")
+                elif cached.json() != fresh.json():
+                    mismatches.append(f"{label}: cached {cached.json()} != fresh {fresh.json()}")
+        except Exception as e:
+            self.log_result("Progress Report Cache", False, f"Error: {str(e)}")
+            return
+        finally:
+            for assignment_id in added:
+                self.session.delete(f"{API_BASE}/assignments/{assignment_id}")
+
+        if mismatches:
+            self.log_result("Progress Report Cache", False, "; ".join(mismatches))
+        else:
+            self.log_result("Progress Report Cache", True, 
+                          f"Cached report matched fresh recomputation after {len(edits)} edits")
+
+    def test_class_progress_reports(self):
+        """Test class- and grade-level batched reports match the per-student progress endpoint"""
+        self.log("\n=== Testing Batched Class Progress Reports ===")
+        
+        if not self.created_students or not self.created_classes:
+            self.log_result("Class Progress Reports", False, "No students or classes available for testing")
+            return
+
+        for class_obj in self.created_classes:
+            test_name = f"Class Progress Report {class_obj['name']}"
+            try:
+                start = time.perf_counter()
+                response = self.session.get(f"{API_BASE}/classes/{class_obj['id']}/progress")
+                batch_elapsed = time.perf_counter() - start
+                if response.status_code != 200:
+                    self.log_result(test_name, False, f"Status code: {response.status_code}")
+                    continue
+                reports = {report['student_id']: report for report in response.json()}
+
+                # Every student in the class's grade level must get the same report as the per-student endpoint
+                students_in_grade = [s for s in self.created_students if s["grade_level"] == class_obj["grade_level"]]
+                mismatches = []
+                start = time.perf_counter()
+                for student in students_in_grade:
+                    single = self.session.get(f"{API_BASE}/students/{student['id']}/progress/{class_obj['id']}")
+                    if single.status_code != 200:
+                        mismatches.append(f"{student['student_id']}: status {single.status_code}")
+                    elif reports.get(student['id']) != single.json():
+                        mismatches.append(f"{student['student_id']}: {reports.get(student['id'])} != {single.json()}")
+                single_elapsed = time.perf_counter() - start
+
+                if mismatches:
+                    self.log_result(test_name, False, "; ".join(mismatches))
+                else:
+                    self.log_result(test_name, True, 
+                                  f"{len(reports)} reports in {batch_elapsed * 1000:.1f}ms "
+                                  f"(per-student calls: {single_elapsed * 1000:.1f}ms)")
+
+                # The NDJSON stream must carry the same reports, one per line
+                streamed = {report['student_id']: report for report in
+                            self.iter_ndjson(f"{API_BASE}/classes/{class_obj['id']}/progress",
+                                             params={"format": "ndjson"})}
+                if streamed == reports:
+                    self.log_result(f"Class Progress NDJSON {class_obj['name']}", True, 
+                                  f"{len(streamed)} streamed reports match")
+                else:
+                    self.log_result(f"Class Progress NDJSON {class_obj['name']}", False, 
+                                  f"Streamed {streamed} != {reports}")
+            except Exception as e:
+                self.log_result(test_name, False, f"Error: {str(e)}")
+
+        # Grade-level report covers every class at that level
+        grade_level = self.created_classes[0]["grade_level"]
+        try:
+            response = self.session.get(f"{API_BASE}/progress", params={"grade_level": grade_level})
+            if response.status_code == 200:
+                reports = response.json()
+                class_ids = {report['class_id'] for report in reports}
+                expected_ids = {c['id'] for c in self.created_classes if c['grade_level'] == grade_level}
+                if expected_ids <= class_ids:
+                    self.log_result("Grade Level Progress Report", True, 
+                                  f"{len(reports)} reports across {len(class_ids)} classes in grade {grade_level}")
+                else:
+                    self.log_result("Grade Level Progress Report", False, 
+                                  f"Missing classes: {expected_ids - class_ids}")
+            else:
+                self.log_result("Grade Level Progress Report", False, f"Status code: {response.status_code}")
+        except Exception as e:
+            self.log_result("Grade Level Progress Report", False, f"Error: {str(e)}")
+
+    def test_response_caching(self, repeats=20):
+        """Test ETag/If-None-Match revalidation and write-driven invalidation on read-heavy GETs"""
+        self.log("\n=== Testing Response Caching ===")
+        
+        if not self.created_students or not self.created_classes:
+            self.log_result("Response Caching", False, "No students or classes available for testing")
+            return
+
+        student = self.created_students[0]
+        class_obj = self.created_classes[0]
+        urls = {
+            "categories": f"{API_BASE}/classes/{class_obj['id']}/categories",
+            "grades": f"{API_BASE}/students/{student['id']}/grades",
+            "progress": f"{API_BASE}/students/{student['id']}/progress/{class_obj['id']}",
+        }
+
+        def timed_get(url, etag=None):
+            start = time.perf_counter()
+            response = self.session.get(url, headers={"If-None-Match": etag} if etag else None)
+            return response, time.perf_counter() - start
+
+        etags = {}
+        not_modified = 0
+        for name, url in urls.items():
+            test_name = f"ETag Revalidation {name}"
+            try:
+                first, cold = timed_get(url)
+                etag = first.headers.get("ETag")
+                if first.status_code != 200 or not etag:
+                    self.log_result(test_name, False, f"Status {first.status_code}, ETag: {etag}")
+                    continue
+                etags[name] = etag
+                warm, conditional, statuses = [], [], []
+                for _ in range(repeats):
+                    warm.append(timed_get(url)[1])
+                    response, elapsed = timed_get(url, etag)
+                    conditional.append(elapsed)
+                    statuses.append(response.status_code)
+                not_modified += statuses.count(304)
+                message = (f"304 on {statuses.count(304)}/{repeats} revalidations; cold {cold * 1000:.2f}ms, "
+                           f"warm median {statistics.median(warm) * 1000:.2f}ms, "
+                           f"conditional median {statistics.median(conditional) * 1000:.2f}ms")
+                self.log_result(test_name, statuses.count(304) == repeats, message)
+            except Exception as e:
+                self.log_result(test_name, False, f"Error: {str(e)}")
+
+        assignment = next((a for a in self.created_assignments if a["class_id"] == class_obj["id"]), None)
+        if assignment is None or len(etags) != len(urls):
+            self.log_result("Cache Invalidation", False, "Missing assignment or ETags to test invalidation")
+            return
+
+        def enter_grade(fraction):
+            return self.session.post(f"{API_BASE}/grades", json={
+                "student_id": student["id"],
+                "assignment_id": assignment["id"],
+                "points_earned": assignment["points_possible"] * fraction,
+                "is_submitted": True,
+                "submission_date": "2024-12-18"
+            })
+
+        try:
+            if enter_grade(0.75).status_code != 200:
+                self.log_result("Cache Invalidation", False, "Grade write failed")
+                return
+
+            # The written student's grades and report must be revalidated to fresh content...
+            grades_response, _ = timed_get(urls["grades"], etags["grades"])
+            grades = grades_response.json() if grades_response.status_code == 200 else []
+            written = [g for g in grades if g["assignment_id"] == assignment["id"]]
+            if written and written[0]["points_earned"] == assignment["points_possible"] * 0.75:
+                self.log_result("Cache Invalidation grades", True, "Grade write invalidated student grades")
+            else:
+                self.log_result("Cache Invalidation grades", False, 
+                              f"Stale grades after write: status {grades_response.status_code}, {written}")
+
+            progress_response, _ = timed_get(urls["progress"], etags["progress"])
+            fresh = self.session.get(urls["progress"], params={"refresh": "true"}).json()
+            if progress_response.status_code == 200 and progress_response.json() == fresh:
+                self.log_result("Cache Invalidation progress", True, "Grade write invalidated progress report")
+            else:
+                self.log_result("Cache Invalidation progress", False, 
+                              f"Status {progress_response.status_code}, report differs from fresh {fresh}")
+
+            # ...while the class's categories, which a grade write does not touch, stay cached
+            categories_response, _ = timed_get(urls["categories"], etags["categories"])
+            if categories_response.status_code == 304:
+                not_modified += 1
+                self.log_result("Cache Invalidation precision", True, "Categories still 304 after a grade write")
+            else:
+                self.log_result("Cache Invalidation precision", False, 
+                              f"Categories revalidated with {categories_response.status_code} after a grade write")
+            enter_grade(0.9)
+        except Exception as e:
+            self.log_result("Cache Invalidation", False, f"Error: {str(e)}")
+
+        # A new assignment in the class must show up in the cached report's totals, and leave with its delete
+        try:
+            before = self.session.get(urls["progress"])
+            response = self.create_assignment({
+                "class_id": class_obj["id"],
+                "name": "Cache Probe Quiz",
+                "description": "Created to invalidate cached progress reports",
+                "category": assignment["category"],
+                "points_possible": 10.0
+            })
+            response.raise_for_status()
+            probe_assignment = response.json()
+            created, _ = timed_get(urls["progress"], before.headers.get("ETag"))
+            self.session.delete(f"{API_BASE}/assignments/{probe_assignment['id']}").raise_for_status()
+            deleted, _ = timed_get(urls["progress"], created.headers.get("ETag"))
+            total = before.json()["total_assignments"]
+            if (created.status_code == 200 and created.json()["total_assignments"] == total + 1
+                    and deleted.status_code == 200 and deleted.json()["total_assignments"] == total):
+                self.log_result("Cache Invalidation assignment", True, 
+                              f"total_assignments {total} -> {total + 1} -> {total} on assignment create and delete")
+            else:
+                self.log_result("Cache Invalidation assignment", False, 
+                              f"total_assignments {total}, then status {created.status_code} "
+                              f"{created.json().get('total_assignments') if created.status_code == 200 else ''}, "
+                              f"then status {deleted.status_code}")
+        except Exception as e:
+            self.log_result("Cache Invalidation assignment", False, f"Error: {str(e)}")
+
+        # Deleting a student or a class must stop its cached reports revalidating
+        for kind, path, payload in (
+                ("student", "students", {"student_id": f"{self.id_prefix}CACHE{uuid.uuid4().hex[:6].upper()}",
+                                         "first_name": "Cache", "last_name": "Probe",
+                                         "grade_level": class_obj["grade_level"]}),
+                ("class", "classes", {"name": "Cache Probe Class", "subject": "Science", "teacher_name": "Ms. Probe",
+                                      "grade_level": student["grade_level"], "school_year": self.school_year})):
+            test_name = f"Cache Invalidation {kind}"
+            try:
+                response = self.session.post(f"{API_BASE}/{path}", json=payload)
+                response.raise_for_status()
+                probe = response.json()
+                url = (f"{API_BASE}/students/{probe['id']}/progress/{class_obj['id']}" if kind == "student"
+                       else f"{API_BASE}/students/{student['id']}/progress/{probe['id']}")
+                cached = self.session.get(url)
+                self.session.delete(f"{API_BASE}/{path}/{probe['id']}").raise_for_status()
+                revalidated, _ = timed_get(url, cached.headers.get("ETag"))
+                if cached.status_code == 200 and cached.headers.get("ETag") and revalidated.status_code == 404:
+                    self.log_result(test_name, True, f"Report of a deleted {kind} revalidates to 404")
+                else:
+                    self.log_result(test_name, False, 
+                                  f"Report status {cached.status_code}, ETag {cached.headers.get('ETag')}; "
+                                  f"after the delete {revalidated.status_code}")
+            except Exception as e:
+                self.log_result(test_name, False, f"Error: {str(e)}")
+
+        self.log(f"   304 Not Modified responses: {not_modified}")
+
+    def test_grading_engine(self):
+        """Test the vectorized grading engine reproduces every progress report exactly"""
+        self.log("\n=== Testing Vectorized Grading Engine ===")
+        
+        if np is None:
+            self.log_result("Grading Engine", False, "numpy is required (pip install numpy)")
+            return
+        if not self.created_students or not self.created_classes:
+            self.log_result("Grading Engine", False, "No students or classes available for testing")
+            return
+
+        try:
+            engine = GradingEngine.from_api(self.session, API_BASE, self.created_students, self.created_classes)
+            start = time.perf_counter()
+            reports = list(engine.reports())
+            standings = engine.gpa_and_rank()
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            self.log_result("Grading Engine", False, f"Error: {str(e)}")
+            return
+
+        mismatches = []
+        for report in reports:
+            response = self.session.get(f"{API_BASE}/students/{report['student_id']}/progress/{report['class_id']}")
+            if response.status_code != 200 or response.json() != report:
+                mismatches.append(f"engine {report} != endpoint {response.text}")
+        if reports and not mismatches:
+            self.log_result("Grading Engine Parity", True, 
+                          f"{len(reports)} reports identical to the progress endpoint ({elapsed * 1000:.1f}ms)")
+        else:
+            self.log_result("Grading Engine Parity", False, "; ".join(mismatches) or "No reports computed")
+
+        # Zero points_possible must give 0%, as /grades and the progress report do in test_grade_entry
+        try:
+            percentages = engine.percentages()
+            zero_points = set(np.nonzero(engine.assignment_points == 0)[0].tolist())
+            assignment_ids = engine.tables["assignment_ids"]
+            engine_reports = {(r["student_id"], r["class_id"]): r for r in reports}
+            checked, mismatches = 0, []
+            for student in self.created_students:
+                s = engine.gradebook.student_index[student["id"]]
+                rows = range(engine.gradebook.student_offsets[s], engine.gradebook.student_offsets[s + 1])
+                api_grades = {g["assignment_id"]: g for g in
+                              self.session.get(f"{API_BASE}/students/{student['id']}/grades").json()}
+                for row in rows:
+                    if engine.grade_assignment[row] not in zero_points:
+                        continue
+                    checked += 1
+                    api_grade = api_grades[assignment_ids[engine.grade_assignment[row]]]
+                    if api_grade.get("percentage") != percentages[row]:
+                        mismatches.append(f"engine {percentages[row]}% != /grades {api_grade.get('percentage')}%")
+                    report = engine_reports.get((student["id"], api_grade["class_id"]))
+                    progress = self.session.get(f"{API_BASE}/students/{student['id']}/progress/{api_grade['class_id']}")
+                    if report is None or progress.status_code != 200 or progress.json() != report:
+                        mismatches.append(f"engine report {report} != endpoint {progress.text}")
+            if checked and not mismatches:
+                self.log_result("Grading Engine Zero Points", True, 
+                              f"{checked} zero-point grades match /grades and the progress report")
+            else:
+                self.log_result("Grading Engine Zero Points", False, 
+                              "; ".join(mismatches) or "No zero-point grades to check")
+        except Exception as e:
+            self.log_result("Grading Engine Zero Points", False, f"Error: {str(e)}")
+
+        # GPA and rank brute-forced from the progress endpoint's letter grades
+        try:
+            endpoint_reports = [self.session.get(f"{API_BASE}/students/{student['id']}/progress/{class_obj['id']}").json()
+                                for student in self.created_students for class_obj in self.created_classes
+                                if student["grade_level"] == class_obj["grade_level"]]
+            expected = self.brute_force_standings(self.created_students, endpoint_reports)
+            if standings == expected:
+                self.log_result("Grading Engine GPA and Rank", True, 
+                              f"{ {s['student_id']: standings[s['id']] for s in self.created_students} }")
+            else:
+                self.log_result("Grading Engine GPA and Rank", False, f"Engine {standings} != brute force {expected}")
+        except Exception as e:
+            self.log_result("Grading Engine GPA and Rank", False, f"Error: {str(e)}")
+
+        # A term window covering the earlier half of the due dates
+        try:
+            due_dates = sorted(set(engine.tables["assignment_due_dates"]) - {""})
+            term = (due_dates[0], due_dates[(len(due_dates) - 1) // 2])
+            categories, assignments, grades = [], [], []
+            for class_obj in self.created_classes:
+                categories += self.session.get(f"{API_BASE}/classes/{class_obj['id']}/categories").json()
+                assignments += self.session.get(f"{API_BASE}/classes/{class_obj['id']}/assignments").json()
+            for student in self.created_students:
+                grades += self.session.get(f"{API_BASE}/students/{student['id']}/grades").json()
+            expected = [self.brute_force_report(student, class_obj, categories, assignments, grades, term)
+                        for student in self.created_students for class_obj in self.created_classes
+                        if student["grade_level"] == class_obj["grade_level"]]
+            term_reports = list(engine.reports(term))
+            key = lambda r: (r["student_id"], r["class_id"])
+            expected_standings = self.brute_force_standings(self.created_students, expected)
+            if (sorted(term_reports, key=key) == sorted(expected, key=key)
+                    and engine.gpa_and_rank(term) == expected_standings):
+                in_term = sum(r["total_assignments"] for r in term_reports)
+                self.log_result("Grading Engine Term Window", True, 
+                              f"Term {term[0]}..{term[1]}: {len(term_reports)} reports and standings match "
+                              f"brute force ({in_term} of the reports' assignments due in term)")
+            else:
+                self.log_result("Grading Engine Term Window", False, 
+                              f"Engine {term_reports} != brute force {expected}")
+        except Exception as e:
+            self.log_result("Grading Engine Term Window", False, f"Error: {str(e)}")
+
+        # A generated dataset, with fractional points, loaded without the API
+        try:
+            generator = DistrictDataGenerator(seed=11, students_per_grade=2, teachers_per_grade=1,
+                                              id_prefix=f"{self.id_prefix}ENG")
+            generated = GradingEngine.from_generator(generator)
+            grades = list(generator.iter_grades())
+            term = ("2024-09-01", "2024-10-31")
+            problems = []
+            for window in (None, term):
+                expected = [self.brute_force_report(student, class_obj, generator.categories, generator.assignments,
+                                                    grades, window)
+                            for student in generator.students for class_obj in generator.classes
+                            if student["grade_level"] == class_obj["grade_level"]]
+                actual = list(generated.reports(window))
+                key = lambda r: (r["student_id"], r["class_id"])
+                if sorted(actual, key=key) != sorted(expected, key=key):
+                    problems.append(f"reports for term {window}")
+                if generated.gpa_and_rank(window) != self.brute_force_standings(generator.students, expected):
+                    problems.append(f"standings for term {window}")
+            if problems:
+                self.log_result("Grading Engine Generated Data", False, f"Differs from brute force: {problems}")
+            else:
+                self.log_result("Grading Engine Generated Data", True, 
+                              f"{len(expected)} reports and {len(generator.students)} standings match brute force "
+                              f"for the year and term {term[0]}..{term[1]}")
+        except Exception as e:
+            self.log_result("Grading Engine Generated Data", False, f"Error: {str(e)}")
+
+        # Hundredth points: 37.19 / 40 scales to 9297.5, which numpy's half-to-even rounding takes to 92.98
+        # while the API's round() gives 92.97
+        class_obj = self.created_classes[0]
+        student = next((s for s in self.created_students if s["grade_level"] == class_obj["grade_level"]), None)
+        probe = None
+        try:
+            response = self.create_assignment({
+                "class_id": class_obj["id"],
+                "name": "Rounding Probe Quiz",
+                "description": "Hundredth-point score",
+                "category": "Tests",
+                "points_possible": 40.0,
+                "due_date": "2024-12-21"
+            })
+            response.raise_for_status()
+            probe = response.json()
+            response = self.session.post(f"{API_BASE}/grades", json={
+                "student_id": student["id"],
+                "assignment_id": probe["id"],
+                "points_earned": 37.19,
+                "is_submitted": True
+            })
+            response.raise_for_status()
+            api_percentage = response.json()["percentage"]
+            probe_engine = GradingEngine.from_api(self.session, API_BASE, [student], [class_obj])
+            row = np.nonzero(probe_engine.grade_assignment
+                             == probe_engine.tables["assignment_ids"].index(probe["id"]))[0][0]
+            report = next(probe_engine.reports(class_id=class_obj["id"]))
+            endpoint = self.session.get(f"{API_BASE}/students/{student['id']}/progress/{class_obj['id']}").json()
+            gpa = probe_engine.gpa_and_rank()[student["id"]]["gpa"]
+            if (probe_engine.percentages()[row] == api_percentage and report == endpoint
+                    and gpa == GPA_POINTS[endpoint["letter_grade"]]):
+                self.log_result("Grading Engine Hundredth Points", True, 
+                              f"37.19/40 at {api_percentage}% like /grades; report and GPA {gpa} match the endpoint")
+            else:
+                self.log_result("Grading Engine Hundredth Points", False, 
+                              f"Engine {probe_engine.percentages()[row]}% vs /grades {api_percentage}%; "
+                              f"report {report} vs endpoint {endpoint}; GPA {gpa}")
+        except Exception as e:
+            self.log_result("Grading Engine Hundredth Points", False, f"Error: {str(e)}")
+        finally:
+            if probe:
+                self.session.delete(f"{API_BASE}/assignments/{probe['id']}")
+
+    def brute_force_report(self, student, class_obj, categories, assignments, grades, term=None):
+        """Progress report computed one grade at a time, limited to assignments due within term"""
+        assignments = {a["id"]: a for a in assignments if a["class_id"] == class_obj["id"]
+                       and (not term or term[0] <= (a.get("due_date") or "")[:10] <= term[1])}
+        by_category = {}
+        completed = 0
+        for grade in grades:
+            if grade["student_id"] != student["id"] or grade["assignment_id"] not in assignments:
+                continue
+            if grade.get("is_submitted"):
+                completed += 1
+                category = assignments[grade["assignment_id"]]["category"]
+                by_category.setdefault(category, []).append(grade.get("percentage") or 0)
+        category_grades = {}
+        total = total_weight = 0.0
+        for category in categories:
+            if category["class_id"] == class_obj["id"] and by_category.get(category["name"]):
+                mean = sum(by_category[category["name"]]) / len(by_category[category["name"]])
+                category_grades[category["name"]] = round(mean, 2)
+                total += mean * category["weight_percentage"]
+                total_weight += category["weight_percentage"]
+        overall = round(total / total_weight, 2) if total_weight else 0.0
+        return {
+            "student_id": student["id"],
+            "student_name": f"{student['first_name']} {student['last_name']}",
+            "class_id": class_obj["id"],
+            "class_name": class_obj["name"],
+            "overall_percentage": overall,
+            "letter_grade": self.get_expected_letter_grade(overall),
+            "category_grades": category_grades,
+            "total_assignments": len(assignments),
+            "completed_assignments": completed,
+            "missing_assignments": len(assignments) - completed,
+        }
+
+    def brute_force_standings(self, students, reports):
+        """GPA over each student's reports and competition rank among the given students of a grade level"""
+        letters = {}
+        for report in reports:
+            letters.setdefault(report["student_id"], []).append(report["letter_grade"])
+        gpa = {student["id"]: round(sum(GPA_POINTS[letter] for letter in letters.get(student["id"], []))
+                                    / len(letters[student["id"]]), 2) if letters.get(student["id"]) else 0.0
+               for student in students}
+        return {student["id"]: {"gpa": gpa[student["id"]],
+                                "rank": 1 + sum(1 for other in students if other["grade_level"] == student["grade_level"]
+                                                and gpa[other["id"]] > gpa[student["id"]]),
+                                "grade_level": student["grade_level"]}
+                for student in students}
+
+    def test_change_feed(self):
+        """Test that a client synced only through the change feed matches a full fetch, for fewer bytes"""
+        self.log("\n=== Testing Change Feed ===")
+
+        if not self.created_students or not self.created_classes:
+            self.log_result("Change Feed", False, "No students or classes available for testing")
+            return
+
+        replica = ChangeFeedReplica(self.session)
+        try:
+            replica.poll()
+            self.log_result("Change Feed Initial Sync", True, 
+                          f"{replica.seq} changes, {replica.bytes_received} bytes")
+        except Exception as e:
+            self.log_result("Change Feed Initial Sync", False, f"Error: {str(e)}")
+            return
+
+        # A long-poll parked on the feed should wake up as soon as a write lands
+        start_seq = replica.seq
+        initial_bytes = replica.bytes_received
+        probe_id = f"{self.id_prefix}FEED{uuid.uuid4().hex[:8].upper()}"
+        waiter = ThreadPoolExecutor(max_workers=1)
+        try:
+            pending = waiter.submit(replica.wait_for, lambda r: any(
+                s["student_id"] == probe_id for s in r.state["students"].values()))
+            time.sleep(0.2)
+            written = time.perf_counter()
+            response = self.session.post(f"{API_BASE}/students", json={
+                "student_id": probe_id,
+                "first_name": "Feed",
+                "last_name": "Probe",
+                "grade_level": self.created_students[0]["grade_level"]
+            })
+            response.raise_for_status()
+            probe = response.json()
+            seen = pending.result(timeout=CHANGE_FEED_TIMEOUT + 5)
+            latency = time.perf_counter() - written
+            if seen:
+                self.log_result("Change Feed Long-Poll", True, f"Woke {latency * 1000:.1f}ms after the write")
+            else:
+                self.log_result("Change Feed Long-Poll", False, 
+                              f"New student not delivered after {latency:.2f}s")
+
+            # Grade, then delete the probe so the feed carries upserts and deletes
+            if self.created_assignments:
+                self.session.post(f"{API_BASE}/grades", json={
+                    "student_id": self.created_students[0]["id"],
+                    "assignment_id": self.created_assignments[0]["id"],
+                    "points_earned": 17.0,
+                    "is_submitted": True
+                }).raise_for_status()
+            self.session.delete(f"{API_BASE}/students/{probe['id']}").raise_for_status()
+            replica.poll()
+        except Exception as e:
+            self.log_result("Change Feed Long-Poll", False, f"Error: {str(e)}")
+            return
+        finally:
+            waiter.shutdown(wait=False)
+        delta_bytes = replica.bytes_received - initial_bytes
+
+        # What a polling client downloads to learn the same state
+        try:
+            full_bytes = 0
+            expected = {collection: {} for collection in ChangeFeedReplica.COLLECTIONS}
+            for collection in ("students", "classes"):
+                for items, payload_bytes, _ in self.iter_pages(collection, page_size=500):
+                    full_bytes += payload_bytes
+                    expected[collection].update((item["id"], item) for item in items)
+            for class_obj in self.created_classes:
+                response = self.session.get(f"{API_BASE}/classes/{class_obj['id']}/assignments")
+                full_bytes += len(response.content)
+                expected["assignments"].update((item["id"], item) for item in response.json())
+            for student in self.created_students:
+                response = self.session.get(f"{API_BASE}/students/{student['id']}/grades")
+                full_bytes += len(response.content)
+                expected["grades"].update((item["id"], item) for item in response.json())
+        except Exception as e:
+            self.log_result("Change Feed Consistency", False, f"Error: {str(e)}")
+            return
+
+        # Compare this tester's namespace, which concurrent writers (other workers, other users) leave alone
+        class_ids = {c["id"] for c in self.created_classes}
+        student_ids = {s["id"] for s in self.created_students}
+
+        def scoped(state):
+            return {
+                "students": {k: v for k, v in state["students"].items() if v["student_id"].startswith(self.id_prefix)},
+                "classes": {k: v for k, v in state["classes"].items() if k in class_ids},
+                "assignments": {k: v for k, v in state["assignments"].items() if v["class_id"] in class_ids},
+                "grades": {k: v for k, v in state["grades"].items()
+                           if v["student_id"] in student_ids and v.get("class_id") in class_ids},
+            }
+
+        actual, expected = scoped(replica.state), scoped(expected)
+        mismatches = [f"{collection}: {len(actual[collection])} replicated vs {len(expected[collection])} fetched"
+                      for collection in ChangeFeedReplica.COLLECTIONS if actual[collection] != expected[collection]]
+        if mismatches:
+            self.log_result("Change Feed Consistency", False, "; ".join(mismatches))
+        else:
+            self.log_result("Change Feed Consistency", True, 
+                          f"Replica matches a full fetch on {sum(map(len, expected.values()))} "
+                          f"{self.id_prefix}* documents")
+        if delta_bytes < full_bytes:
+            self.log_result("Change Feed Bytes", True, 
+                          f"{replica.seq - start_seq} changes in {delta_bytes} bytes vs {full_bytes} bytes "
+                          f"re-fetched ({full_bytes / max(delta_bytes, 1):.0f}x less)")
+        else:
+            self.log_result("Change Feed Bytes", False, 
+                          f"Incremental sync moved {delta_bytes} bytes vs {full_bytes} for a full fetch")
+
+        # Server-sent events must replay the same history to a fresh replica
+        if isinstance(self.session, EmbeddedBackend):
+            self.log("⏭️  Change Feed Event Stream: needs a socket; the in-process client buffers whole responses")
+            return
+        try:
+            streamed = ChangeFeedReplica(self.session)
+            streamed.stream(until_seq=replica.seq)
+            if streamed.state == replica.state:
+                self.log_result("Change Feed Event Stream", True, f"Replayed {streamed.seq} events")
+            else:
+                self.log_result("Change Feed Event Stream", False, 
+                              f"Stream replica at seq {streamed.seq} differs from the polled replica")
+        except Exception as e:
+            self.log_result("Change Feed Event Stream", False, f"Error: {str(e)}")
+
+    def brute_force_class_analytics(self, class_obj):
+        """Class analytics rebuilt from every enrolled student's progress report and grades"""
+        category_of = {a["id"]: a["category"] for a in
+                       self.session.get(f"{API_BASE}/classes/{class_obj['id']}/assignments").json()}
+        students = self.fetch_all("students", {"grade_level": class_obj["grade_level"]})
+        letters = {letter: 0 for letter in GPA_POINTS}
+        percentages = {}
+        at_risk = []
+        for student in students:
+            report = self.session.get(f"{API_BASE}/students/{student['id']}/progress/{class_obj['id']}").json()
+            letters[report["letter_grade"]] += 1
+            if report["letter_grade"] in AT_RISK_LETTERS:
+                at_risk.append({key: report[key] for key in ("student_id", "student_name", "overall_percentage",
+                                                             "letter_grade", "missing_assignments")})
+            for grade in self.session.get(f"{API_BASE}/students/{student['id']}/grades").json():
+                if grade["assignment_id"] in category_of and grade.get("is_submitted"):
+                    percentages.setdefault(category_of[grade["assignment_id"]], []).append(grade["percentage"] or 0)
+        return {
+            "students": len(students),
+            "letter_grades": letters,
+            "categories": {name: {"count": len(values),
+                                  "quantiles": {key: percentile(values, pct) for key, pct in ANALYTICS_QUANTILES.items()}}
+                           for name, values in percentages.items()},
+            "at_risk": sorted(at_risk, key=lambda r: (r["overall_percentage"], r["student_id"])),
+        }
+
+    def compare_class_analytics(self, served, expected):
+        """Differences between served and brute-force analytics; quantiles may be off by the sketch tolerance"""
+        problems = []
+        for key in ("students", "letter_grades", "at_risk"):
+            if served.get(key) != expected[key]:
+                problems.append(f"{key}: served {served.get(key)} != expected {expected[key]}")
+        categories = {name: stats for name, stats in served.get("categories", {}).items() if stats["count"]}
+        if set(categories) != set(expected["categories"]):
+            problems.append(f"categories: served {sorted(categories)} != expected {sorted(expected['categories'])}")
+        for name, stats in expected["categories"].items():
+            if name not in categories:
+                continue
+            if categories[name]["count"] != stats["count"]:
+                problems.append(f"{name} count: served {categories[name]['count']} != expected {stats['count']}")
+            for key, value in stats["quantiles"].items():
+                served_value = categories[name]["quantiles"].get(key)
+                if served_value is None or abs(served_value - value) > ANALYTICS_QUANTILE_TOLERANCE:
+                    problems.append(f"{name} {key}: served {served_value} vs exact {value}")
+        return problems
+
+    def test_grade_analytics(self):
+        """Test class grade distributions, category quantiles and at-risk lists against brute force"""
+        self.log("\n=== Testing Grade Analytics ===")
+
+        if not self.created_classes or not self.created_assignments:
+            self.log_result("Grade Analytics", False, "No classes or assignments available for testing")
+            return
+
+        for class_obj in self.created_classes:
+            test_name = f"Grade Analytics {class_obj['name']}"
+            try:
+                start = time.perf_counter()
+                response = self.session.get(f"{API_BASE}/analytics/classes/{class_obj['id']}")
+                served_elapsed = time.perf_counter() - start
+                if response.status_code != 200:
+                    self.log_result(test_name, False, f"Status: {response.status_code}, Response: {response.text}")
+                    continue
+                start = time.perf_counter()
+                expected = self.brute_force_class_analytics(class_obj)
+                brute_elapsed = time.perf_counter() - start
+                problems = self.compare_class_analytics(response.json(), expected)
+                if problems:
+                    self.log_result(test_name, False, "; ".join(problems))
+                else:
+                    self.log_result(test_name, True, 
+                                  f"{expected['students']} students, letters {expected['letter_grades']}, "
+                                  f"{len(expected['at_risk'])} at risk; served in {served_elapsed * 1000:.1f}ms "
+                                  f"vs {brute_elapsed * 1000:.1f}ms brute force")
+            except Exception as e:
+                self.log_result(test_name, False, f"Error: {str(e)}")
+
+        # A failing grade must show up in the very next read, not after a rebuild
+        assignment = self.created_assignments[0]
+        class_obj = next((c for c in self.created_classes if c["id"] == assignment["class_id"]), None)
+        student = next((s for s in self.created_students
+                        if class_obj and s["grade_level"] == class_obj["grade_level"]), None)
+        if not student:
+            self.log_result("Grade Analytics After Write", False, "No enrolled student to grade")
+            return
+        try:
+            response = self.session.post(f"{API_BASE}/grades", json={
+                "student_id": student["id"],
+                "assignment_id": assignment["id"],
+                "points_earned": 0.0,
+                "is_submitted": True
+            })
+            response.raise_for_status()
+            served = self.session.get(f"{API_BASE}/analytics/classes/{class_obj['id']}").json()
+            problems = self.compare_class_analytics(served, self.brute_force_class_analytics(class_obj))
+            at_risk = [r["student_id"] for r in served.get("at_risk", [])]
+            if problems:
+                self.log_result("Grade Analytics After Write", False, "; ".join(problems))
+            else:
+                self.log_result("Grade Analytics After Write", True, 
+                              f"Zero on {assignment['name']} reflected immediately; "
+                              f"{student['student_id']} {'on' if student['id'] in at_risk else 'not on'} the at-risk list")
+        except Exception as e:
+            self.log_result("Grade Analytics After Write", False, f"Error: {str(e)}")
+
+    def test_compact_gradebook(self):
+        """Test the compact gradebook answers progress queries like the API, before and after mmap"""
+        self.log("\n=== Testing Compact Gradebook ===")
+        
+        if not self.created_students or not self.created_classes:
+            self.log_result("Compact Gradebook", False, "No students or classes available for testing")
+            return
+
+        path = None
+        try:
+            gradebook = CompactGradebook.from_api(self.session, API_BASE, self.created_students, self.created_classes)
+            with tempfile.NamedTemporaryFile(suffix=".gradebook", delete=False) as f:
+                path = f.name
+            gradebook.save(path)
+            mapped = CompactGradebook.load(path)
+        except Exception as e:
+            self.log_result("Compact Gradebook", False, f"Error: {str(e)}")
+            if path:
+                os.remove(path)
+            return
+
+        try:
+            for label, book in (("in-memory", gradebook), ("memory-mapped", mapped)):
+                mismatches = []
+                document_bytes = 0
+                for class_obj in self.created_classes:
+                    for report in book.class_reports(class_obj["id"]):
+                        response = self.session.get(
+                            f"{API_BASE}/students/{report['student_id']}/progress/{class_obj['id']}")
+                        if response.status_code != 200 or response.json() != report:
+                            mismatches.append(f"gradebook {report} != endpoint {response.text}")
+                for student in self.created_students:
+                    # The gradebook covers this tester's classes; other classes of the grade level fan out too
+                    api_grades = [g for g in self.session.get(f"{API_BASE}/students/{student['id']}/grades").json()
+                                  if g.get("class_id") in book.class_index]
+                    document_bytes += len(json.dumps(api_grades))
+                    fields = ("assignment_id", "points_earned", "percentage", "is_submitted")
+                    expected = sorted((tuple(g.get(k) for k in fields) for g in api_grades), key=str)
+                    actual = sorted((tuple(g[k] for k in fields) for g in book.student_grades(student["id"])),
+                                    key=str)
+                    if expected != actual:
+                        mismatches.append(f"grades of {student['student_id']}: {actual} != {expected}")
+                if mismatches:
+                    self.log_result(f"Compact Gradebook {label}", False, "; ".join(mismatches))
+                else:
+                    self.log_result(f"Compact Gradebook {label}", True, 
+                                  f"Reports and grades match the API; {book.nbytes()} array bytes "
+                                  f"vs {document_bytes} bytes of grade JSON")
+        finally:
+            mapped.close()
+            os.remove(path)
+
+        # Generated points are fractional (e.g. 33.2), which a float32 column would not read back exactly
+        path = None
+        try:
+            generator = DistrictDataGenerator(seed=7, students_per_grade=2, teachers_per_grade=1,
+                                              id_prefix=f"{self.id_prefix}CGB")
+            gradebook = CompactGradebook.from_records(generator.students, generator.classes, generator.categories,
+                                                      generator.assignments, generator.iter_grades())
+            with tempfile.NamedTemporaryFile(suffix=".gradebook", delete=False) as f:
+                path = f.name
+            gradebook.save(path)
+            mapped = CompactGradebook.load(path)
+            fields = ("assignment_id", "points_earned", "percentage", "is_submitted", "is_missing")
+            expected = {}
+            for grade in generator.iter_grades():
+                expected.setdefault(grade["student_id"], []).append(tuple(grade[k] for k in fields))
+            fractional = sum(1 for rows in expected.values() for row in rows
+                             if row[1] is not None and row[1] != int(row[1]))
+            mismatches = [f"{label} grades of {student['student_id']}"
+                          for label, book in (("in-memory", gradebook), ("memory-mapped", mapped))
+                          for student in generator.students
+                          if sorted((tuple(g[k] for k in fields) for g in book.student_grades(student["id"])),
+                                    key=str) != sorted(expected[student["id"]], key=str)]
+            mapped.close()
+            if fractional and not mismatches:
+                self.log_result("Compact Gradebook Generated Points", True, 
+                              f"{sum(map(len, expected.values()))} generated grades read back exactly, "
+                              f"{fractional} with fractional points")
+            else:
+                self.log_result("Compact Gradebook Generated Points", False, 
+                              f"{fractional} fractional grades; mismatched: {', '.join(mismatches[:5])}")
+        except Exception as e:
+            self.log_result("Compact Gradebook Generated Points", False, f"Error: {str(e)}")
+        finally:
+            if path:
+                os.remove(path)
+
+    def expected_export_counts(self, page_size=200):
+        """Row counts the export endpoints should produce on an arbitrary database, from the paged list
+        endpoints; costs one /grades request per student, so --export-check seeds a dataset of known size instead"""
+        classes = self.fetch_all("classes", {"fields": "grade_level"})
+        students = grades = 0
+        students_per_level = {}
+        # Count one page of students' grades at a time, so memory does not grow with the database
+        for items, _, _ in self.iter_pages("students", {"fields": "grade_level"}, page_size):
+            for response in self.gather([("GET", f"{API_BASE}/students/{student['id']}/grades", {})
+                                         for student in items]):
+                grades += len(response.json())
+            for student in items:
+                students_per_level[student['grade_level']] = students_per_level.get(student['grade_level'], 0) + 1
+            students += len(items)
+        return {
+            'students': students,
+            'grades': grades,
+            'progress': sum(students_per_level.get(c['grade_level'], 0) for c in classes),
+        }
+
+    def test_streaming_export(self, expected_counts=None, server_pid=SERVER_PID,
+                              memory_budget_mb=EXPORT_MEMORY_BUDGET_MB):
+        """Test NDJSON/CSV exports stream the right row counts within the server memory budget"""
+        self.log("\n=== Testing Streaming Export ===")
+        
+        try:
+            expected_counts = expected_counts or self.expected_export_counts()
+        except Exception as e:
+            self.log_result("Streaming Export", False, f"Could not compute expected counts: {str(e)}")
+            return
+
+        for kind in ("students", "grades", "progress"):
+            for fmt, reader in (("ndjson", self.iter_ndjson), ("csv", self.iter_csv)):
+                test_name = f"Export {kind} ({fmt})"
+                try:
+                    start = time.perf_counter()
+                    rows = sum(1 for _ in reader(f"{API_BASE}/export/{kind}", params={"format": fmt}))
+                    elapsed = time.perf_counter() - start
+                    if rows == expected_counts[kind]:
+                        self.log_result(test_name, True, f"{rows} rows in {elapsed * 1000:.1f}ms")
+                    else:
+                        self.log_result(test_name, False, f"Expected {expected_counts[kind]} rows, got {rows}")
+                except Exception as e:
+                    self.log_result(test_name, False, f"Error: {str(e)}")
+
+        # Peak RSS can only be read for a backend process on this host
+        if not server_pid:
+            self.log("ℹ️  Export memory check skipped (set SERVER_PID to the backend process id)")
+            return
+        peak_rss = read_peak_rss_mb(server_pid)
+        if peak_rss is None:
+            self.log_result("Export Memory Budget", False, f"Could not read /proc/{server_pid}/status")
+        elif peak_rss <= memory_budget_mb:
+            self.log_result("Export Memory Budget", True, 
+                          f"Peak server RSS {peak_rss:.1f}MB within {memory_budget_mb:.0f}MB budget")
+        else:
+            self.log_result("Export Memory Budget", False, 
+                          f"Peak server RSS {peak_rss:.1f}MB exceeds {memory_budget_mb:.0f}MB budget")
+
+    def run_export_check(self, scale="small", seed=42, load_via="db"):
+        """Seed a generated dataset into an empty database, export it and check the generator's row counts.
+
+        Every class enrolls all students of its grade level, so rows from any other data in
+        the database would not simply add to the generator's counts.
+        """
+        print(f"📤 Export check on the {scale} dataset (seed {seed})")
+        print("=" * 60)
+        try:
+            generator = seed_dataset(scale, seed=seed, via=load_via, session=self.session)
+        except Exception as e:
+            self.log_result("Seed Export Dataset", False, f"Error: {str(e)}")
+            return False
+        self.test_streaming_export(expected_counts=generator.expected_counts())
+        self.print_summary()
+        return self.test_results['failed'] == 0
+
+    def run_query_plan_diagnostics(self, mongo_url=MONGO_URL, db_name=DB_NAME, create_indexes=False):
+        """Explain every hot-path query and fail any endpoint whose plan uses a collection scan"""
+        print(f"🔬 Query-plan diagnostics against {mongo_url}/{db_name}")
+        print("=" * 60)
+        if pymongo is None:
+            self.log_result("Query Plan Diagnostics", False, "pymongo is required (pip install pymongo)")
+            return False
+
+        client = pymongo.MongoClient(mongo_url, serverSelectionTimeoutMS=5000)
+        try:
+            db = client[db_name]
+            try:
+                if create_indexes:
+                    ensure_indexes(db)
+                unique_keys = {tuple(index['key']) for index in db.students.index_information().values()
+                               if index.get('unique')}
+            except pymongo.errors.PyMongoError as e:
+                self.log_result("Query Plan Diagnostics", False, f"Index inspection failed on {mongo_url}: {str(e)}")
+                return False
+            if (('student_id', 1),) in unique_keys:
+                self.log_result("Unique student_id Index", True, "students.student_id is unique")
+            else:
+                self.log_result("Unique student_id Index", False, "No unique index on students.student_id")
+
+            for endpoint, collection, query, sort in QUERY_PLANS:
+                try:
+                    cursor = db[collection].find(query)
+                    if sort:
+                        cursor = cursor.sort(sort)
+                    stages = list(plan_stages(cursor.explain().get('queryPlanner', {})))
+                    if 'COLLSCAN' in stages:
+                        self.log_result(f"Query Plan {endpoint}", False, f"Collection scan on {collection}: {stages}")
+                    elif stages == ['EOF']:
+                        self.log_result(f"Query Plan {endpoint}", False, 
+                                      f"Collection {collection} does not exist; seed data or pass --create-indexes")
+                    else:
+                        self.log_result(f"Query Plan {endpoint}", True, " -> ".join(stages))
+                except Exception as e:
+                    self.log_result(f"Query Plan {endpoint}", False, f"Error: {str(e)}")
+        finally:
+            client.close()
+        return self.test_results['failed'] == 0
+
+    def time_request(self, method, url, json_body=None, warmup=5, samples=30):
+        """Latency samples in seconds for one endpoint, after warm-up calls"""
+        timings = []
+        for n in range(warmup + samples):
+            start = time.perf_counter()
+            response = self.session.request(method, url, json=json_body)
+            elapsed = time.perf_counter() - start
+            if response.status_code >= 400:
+                raise RuntimeError(f"{method} {url} returned {response.status_code}: {response.text}")
+            if n >= warmup:
+                timings.append(elapsed)
+        return timings
+
+    def benchmark_endpoints(self, warmup=5, samples=30):
+        """Time every endpoint the tester touches against the data currently in the backend.
+
+        The assignments created for and by the timed calls are deleted afterwards.
+        """
+        student = self.fetch_page("students", {"limit": 1})[0]
+        class_obj = self.fetch_page("classes", {"limit": 1, "grade_level": student["grade_level"]})[0]
+        existing = {a["id"] for a in self.fetch_page(f"classes/{class_obj['id']}/assignments", {})}
+        try:
+            return self.time_endpoints(student, class_obj, warmup, samples)
+        finally:
+            created = [a["id"] for a in self.fetch_page(f"classes/{class_obj['id']}/assignments", {})
+                       if a["id"] not in existing]
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                statuses = list(pool.map(
+                    lambda aid: self.session.delete(f"{API_BASE}/assignments/{aid}").status_code, created))
+            failed = [status for status in statuses if status not in (200, 204, 404)]
+            if failed:
+                self.log_result("Benchmark Cleanup", False, 
+                              f"{len(failed)} of {len(created)} assignment deletes failed: {failed[:5]}")
+
+    def time_endpoints(self, student, class_obj, warmup, samples):
+        """Median and p95 latency of each endpoint, timed against the given student and class"""
+        assignment = self.create_assignment({
+            "class_id": class_obj["id"],
+            "name": "Benchmark Worksheet",
+            "category": "Homework",
+            "points_possible": 20.0,
+            "due_date": "2024-12-20"
+        }).json()
+        grade_payload = {
+            "student_id": student["id"],
+            "assignment_id": assignment["id"],
+            "points_earned": 18.0,
+            "is_submitted": True,
+            "submission_date": "2024-12-15"
+        }
+        new_assignment = {
+            "class_id": class_obj["id"],
+            "name": "Benchmark Quiz",
+            "category": "Tests",
+            "points_possible": 10.0,
+            "due_date": "2024-12-21"
+        }
+        targets = [
+            ("GET", f"{API_BASE}/", None),
+            ("GET", f"{API_BASE}/dashboard", None),
+            ("GET", f"{API_BASE}/students", None),
+            ("GET", f"{API_BASE}/classes", None),
+            ("GET", f"{API_BASE}/classes/{class_obj['id']}/categories", None),
+            ("POST", f"{API_BASE}/grades", grade_payload),
+            ("GET", f"{API_BASE}/students/{student['id']}/grades", None),
+            ("GET", f"{API_BASE}/students/{student['id']}/progress/{class_obj['id']}", None),
+            # Last, because every call adds an assignment and fans out grade records
+            ("POST", f"{API_BASE}/assignments", new_assignment),
+        ]
+        results = {}
+        for method, url, body in targets:
+            timings = self.time_request(method, url, body, warmup=warmup, samples=samples)
+            results[endpoint_label(method, url)] = {
+                'median_ms': round(statistics.median(timings) * 1000, 3),
+                'p95_ms': round(percentile(timings, 95) * 1000, 3),
+                'samples': [round(t * 1000, 3) for t in timings],
+            }
+            self.log(f"   {endpoint_label(method, url):<50} median {results[endpoint_label(method, url)]['median_ms']:.2f}ms")
+        return results
+
+    def fetch_page(self, path, params):
+        response = self.session.get(f"{API_BASE}/{path}", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def run_benchmarks(self, scales=("small", "medium"), baseline_path=BENCHMARK_BASELINE,
+                       update_baseline=False, threshold=REGRESSION_THRESHOLD, alpha=REGRESSION_ALPHA,
+                       warmup=5, samples=30, seed=42, load_via="db"):
+        """Benchmark every endpoint at growing dataset sizes and compare with a JSON baseline.
+
+        Scales are seeded cumulatively on top of each other (already loaded scales
+        are skipped), so start from a fresh database for results comparable with
+        the baseline.
+        """
+        print(f"⏱️  Endpoint benchmarks at scales {list(scales)} (baseline: {baseline_path})")
+        print("=" * 60)
+        results = {}
+        for n, scale in enumerate(scales):
+            seed_dataset(scale, seed=seed + n, via=load_via, session=self.session)
+            self.log(f"\n=== Benchmarking at {scale} scale ===")
+            results[scale] = self.benchmark_endpoints(warmup=warmup, samples=samples)
+
+        baseline = None
+        if os.path.exists(baseline_path):
+            with open(baseline_path) as f:
+                baseline = json.load(f).get('results')
+
+        if baseline is None or update_baseline:
+            with open(baseline_path, 'w') as f:
+                json.dump({'created_at': datetime.now().isoformat(timespec='seconds'), 'seed': seed,
+                           'warmup': warmup, 'samples': samples, 'results': results}, f, indent=2)
+            print(f"\n💾 Baseline written to {baseline_path}")
+            return True
+
+        print("\n" + "=" * 60)
+        print("🏁 BENCHMARK COMPARISON")
+        print("=" * 60)
+        for scale, endpoints in results.items():
+            for label, current in endpoints.items():
+                reference = baseline.get(scale, {}).get(label)
+                test_name = f"Benchmark {scale} {label}"
+                if reference is None:
+                    self.log_result(test_name, True, f"{current['median_ms']:.2f}ms (no baseline)")
+                    continue
+                ratio = current['median_ms'] / reference['median_ms'] if reference['median_ms'] else float('inf')
+                p_value = mann_whitney_p_greater(current['samples'], reference['samples'])
+                message = f"{reference['median_ms']:.2f}ms -> {current['median_ms']:.2f}ms ({ratio:.2f}x, p={p_value:.4f})"
+                regressed = ratio > 1 + threshold and p_value < alpha
+                self.log_result(test_name, not regressed, message)
+        return self.test_results['failed'] == 0
+
     def get_expected_letter_grade(self, percentage):
         """Helper to calculate expected letter grade"""
         if percentage >= 90:
@@ -475,7 +3041,7 @@ class SchoolManagementTester:
 
     def test_error_handling(self):
         """Test error handling for invalid data"""
-        print("\n=== Testing Error Handling ===")
+        self.log("\n=== Testing Error Handling ===")
         
         # Test invalid student ID
         try:
@@ -504,21 +3070,176 @@ class SchoolManagementTester:
         except Exception as e:
             self.log_result("Invalid Assignment Data", False, f"Error: {str(e)}")
 
+    def run_suites(self, suites):
+        for suite in suites:
+            getattr(self, suite)()
+
+    def selected_suites(self, suites=TEST_SUITES):
+        """The given suites, less the contract suites unless this tester runs them"""
+        return [suite for suite in suites if self.contract or suite not in CONTRACT_SUITES]
+
     def run_all_tests(self):
         """Run all test suites"""
         print("🚀 Starting Comprehensive Backend API Tests")
         print("=" * 60)
         
-        self.test_api_connection()
-        self.test_dashboard_stats()
-        self.test_student_management()
-        self.test_class_management()
-        self.test_assignment_creation()
-        self.test_grade_entry()
-        self.test_progress_reports()
-        self.test_error_handling()
-        
-        # Final summary
+        self.run_suites(self.selected_suites())
+        self.print_summary()
+        self.print_server_metrics()
+        return self.test_results['failed'] == 0
+
+    def run_parallel_tests(self, workers=4):
+        """Run the suites across worker processes, each in its own namespace, and merge their results.
+
+        Every worker first creates its own fixtures, then pulls the remaining suites
+        from a shared queue, so one slow suite does not hold up the others. Suites that
+        compare whole collections are queued once every worker has stopped writing,
+        suites checking exact global counters run last and alone, and each worker
+        deletes its namespace on exit.
+        """
+        print(f"🚀 Starting Backend API Tests in {workers} parallel workers")
+        print("=" * 60)
+        shared = [suite for suite in self.selected_suites()
+                  if suite not in FIXTURE_SUITES + EXCLUSIVE_SUITES + SOLO_SUITES]
+        token = uuid.uuid4().hex[:4].upper()
+        first_year = random.SystemRandom().randrange(2100, 9900, 100)
+        # Forking skips re-importing the harness in every worker, but is unsafe once threads exist
+        # (the async client runs an event-loop thread)
+        forkable = "fork" in multiprocessing.get_all_start_methods() and threading.active_count() == 1
+        context = multiprocessing.get_context("fork" if forkable else "spawn")
+        barrier = context.Barrier(workers)
+        results = context.Queue()
+        queues = []
+        for batches in ([[suite] for suite in shared], [[suite] for suite in self.selected_suites(EXCLUSIVE_SUITES)],
+                        [self.selected_suites(SOLO_SUITES)]):
+            queue = context.Queue()
+            for batch in batches + [None] * workers:
+                queue.put(batch)
+            queues.append(queue)
+        processes = []
+        start = time.perf_counter()
+        for worker in range(workers):
+            namespace = {"id_prefix": f"W{worker}{token}-",
+                         "school_year": f"{first_year + worker}-{first_year + worker + 1}"}
+            options = {**self.client_options, "fanout": self.fanout_mode, "contract": self.contract, **namespace}
+            process = context.Process(target=run_suite_worker, args=(
+                worker, queues, options, barrier, results))
+            process.start()
+            processes.append(process)
+
+        reports = {}
+        for _ in processes:
+            try:
+                worker, output, test_results = results.get(timeout=WORKER_TIMEOUT * 3)
+            except Exception:
+                break
+            reports[worker] = (output, test_results)
+        for process in processes:
+            process.join(timeout=WORKER_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+        elapsed = time.perf_counter() - start
+
+        for worker in range(workers):
+            if worker not in reports:
+                self.log_result(f"Worker {worker}", False, "Exited without reporting results")
+                continue
+            output, test_results = reports[worker]
+            self.log(f"\n{'-' * 20} Worker {worker} {'-' * 20}")
+            self.log(output.rstrip())
+            with self.results_lock:
+                self.test_results['passed'] += test_results['passed']
+                self.test_results['failed'] += test_results['failed']
+                self.test_results['errors'] += [f"[worker {worker}] {error}" for error in test_results['errors']]
+        print(f"\n⏱️  {workers} workers finished in {elapsed:.1f}s")
+        self.print_summary()
+        self.print_server_metrics()
+        return self.test_results['failed'] == 0
+
+    def run_embedded_comparison(self):
+        """Run every suite against the live backend and an embedded copy, and compare check by check"""
+        print(f"🚀 Comparing the live backend at {API_BASE} with the embedded app from {BACKEND_DIR}")
+        print("=" * 60)
+        # One namespace for both runs, so check names (which include student IDs) line up
+        namespace = {"id_prefix": f"CMP{uuid.uuid4().hex[:4].upper()}-",
+                     "school_year": f"{random.SystemRandom().randrange(2100, 9900)}-0000"}
+        runs = {}
+        for label, client_options in (("live", self.client_options), ("embedded", {"client": "embedded"})):
+            try:
+                tester = SchoolManagementTester(verbose=False, fanout=self.fanout_mode, contract=self.contract,
+                                                **client_options, **namespace)
+            except Exception as e:
+                self.log_result(f"Start {label} backend", False, f"Error: {str(e)}")
+                return False
+            if label == "live":
+                # Whatever already exists in the live database survives the cleanup below
+                try:
+                    existing = {document["id"] for path in ("students", "classes")
+                                for document in tester.fetch_all(path)}
+                except Exception as e:
+                    self.log_result("Snapshot live backend", False, f"Error: {str(e)}")
+                    tester.session.close()
+                    return False
+            start = time.perf_counter()
+            tester.run_suites(tester.selected_suites())
+            elapsed = time.perf_counter() - start
+            runs[label] = (dict(tester.outcomes), elapsed)
+            if label == "live":
+                students, classes = tester.cleanup_namespace(keep=existing)
+                self.log(f"🧹 Removed {students} students and {classes} classes created in {tester.id_prefix}*")
+                for name in tester.outcomes.keys() - runs[label][0].keys():
+                    self.log_result(name, tester.outcomes[name], "on the live backend")
+            tester.session.close()
+            print(f"{label:>9}: {tester.test_results['passed']} passed, {tester.test_results['failed']} failed "
+                  f"in {elapsed:.2f}s")
+
+        (live, live_time), (embedded, embedded_time) = runs["live"], runs["embedded"]
+        status = {True: "passed", False: "failed"}
+        # Checks that need a socket (server-sent events) only run live
+        for name in sorted(live.keys() ^ embedded.keys()):
+            self.log(f"⏭️  {name}: only run {'live' if name in live else 'embedded'}")
+        common = sorted(live.keys() & embedded.keys())
+        for name in common:
+            if live[name] != embedded[name]:
+                self.log_result(f"Embedded Parity {name}", False, 
+                              f"live {status[live[name]]}, embedded {status[embedded[name]]}")
+        self.log_result("Embedded Parity", self.test_results['failed'] == 0, 
+                      f"{sum(live[name] == embedded[name] for name in common)}/{len(common)} checks agree; "
+                      f"embedded {embedded_time:.2f}s vs live {live_time:.2f}s")
+        self.print_summary()
+        return self.test_results['failed'] == 0
+
+    def cleanup_namespace(self, keep=frozenset()):
+        """Delete this tester's students and classes, with the classes' assignments; grades go with them.
+
+        Students and classes whose ids are in keep are left alone. Returns the numbers of students and
+        classes deleted; deletes the backend refuses are logged as a failed check.
+        """
+        students = [s for s in self.fetch_all("students")
+                    if s["student_id"].startswith(self.id_prefix) and s["id"] not in keep]
+        # Filter here too: a backend without the school_year filter returns every class
+        classes = [c for c in self.fetch_all("classes", {"school_year": self.school_year})
+                   if c.get("school_year") == self.school_year and c["id"] not in keep]
+
+        def delete(path):
+            return path, self.session.delete(f"{API_BASE}/{path}").status_code
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assignments = [assignment for response in pool.map(
+                lambda c: self.session.get(f"{API_BASE}/classes/{c['id']}/assignments"), classes)
+                for assignment in response.json()]
+            statuses = list(pool.map(delete, [f"assignments/{a['id']}" for a in assignments]))
+            statuses += list(pool.map(delete, [f"classes/{c['id']}" for c in classes]
+                                      + [f"students/{s['id']}" for s in students]))
+        # 404 means a suite already deleted it
+        failed = [f"{path}: {status}" for path, status in statuses if status not in (200, 204, 404)]
+        if failed:
+            self.log_result(f"Cleanup {self.id_prefix}*", False, 
+                          f"{len(failed)} of {len(statuses)} deletes failed: {', '.join(failed[:5])}")
+        deleted = [path.split("/")[0] for path, status in statuses if status in (200, 204)]
+        return deleted.count("students"), deleted.count("classes")
+
+    def print_summary(self):
         print("\n" + "=" * 60)
         print("🏁 TEST SUMMARY")
         print("=" * 60)
@@ -530,12 +3251,247 @@ class SchoolManagementTester:
             print(f"\n🔍 Failed Tests:")
             for error in self.test_results['errors']:
                 print(f"   • {error}")
-        
-        return self.test_results['failed'] == 0
+
+    def fetch_server_metrics(self):
+        """Server-side timing and instrumentation from /api/metrics, or None if the backend has none"""
+        try:
+            response = self.session.get(f"{API_BASE}/metrics")
+            if response.status_code == 200:
+                return response.json()
+        except Exception:
+            pass
+        return None
+
+    def print_server_metrics(self, limit=15):
+        """Print the server's per-route timing breakdown next to the harness summary"""
+        metrics = self.fetch_server_metrics()
+        if not metrics:
+            print("\nℹ️  Server metrics unavailable (GET /api/metrics)")
+            return
+        routes = sorted(metrics.get('routes', {}).items(), key=lambda item: -item[1].get('p95_ms', 0))
+        phases = sorted({phase for _, row in routes for phase in row.get('phases_ms', {})})
+        print("\n" + "=" * 60)
+        print("🖥️  SERVER METRICS (slowest p95 first)")
+        print("=" * 60)
+        print(f"{'Route':<50} {'count':>7} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8} {'db ops':>7}"
+              + "".join(f" {phase[:14]:>14}" for phase in phases))
+        for route, row in routes[:limit]:
+            print(f"{route:<50} {row.get('count', 0):>7} {row.get('p50_ms', 0):>8.2f} {row.get('p95_ms', 0):>8.2f} "
+                  f"{row.get('p99_ms', 0):>8.2f} {row.get('db_ops_per_request', 0):>7.1f}"
+                  + "".join(f" {row.get('phases_ms', {}).get(phase, 0):>14.2f}" for phase in phases))
+        profiles = metrics.get('slow_profiles', [])
+        if profiles:
+            print(f"\n🐢 {len(profiles)} slow request profile(s) captured:")
+            for profile in profiles[:3]:
+                print(f"   {profile.get('route')} ({profile.get('duration_ms', 0):.1f}ms)")
+                for frame in profile.get('top', [])[:5]:
+                    print(f"      {frame}")
+
+    def run_load_test(self, users=10, target_rps=50.0, ramp_up=10.0, duration=60.0,
+                      scenarios=LOAD_TEST_SCENARIOS):
+        """Run the test scenarios as concurrent virtual users and report per-endpoint latency.
+
+        The fixtures are created once in a namespace of their own, which is deleted after the run,
+        so every iteration re-grades and reads the same records instead of adding new ones.
+        """
+        print(f"🔥 Load test: {users} virtual users, {target_rps} req/s target, "
+              f"{ramp_up}s ramp-up, {duration}s duration")
+        print("=" * 60)
+
+        year = random.SystemRandom().randrange(2100, 9900)
+        fixtures = SchoolManagementTester(session=self.session, verbose=self.verbose, fanout=self.fanout_mode,
+                                          id_prefix=f"LOAD{uuid.uuid4().hex[:6].upper()}-",
+                                          school_year=f"{year}-{year + 1}")
+        try:
+            fixtures.run_suites(FIXTURE_SUITES)
+            report = self.drive_virtual_users(fixtures, users, target_rps, ramp_up, duration, scenarios)
+        finally:
+            students, classes = fixtures.cleanup_namespace()
+            fixtures.log(f"🧹 Removed {students} students and {classes} classes in {fixtures.id_prefix}*")
+            for key in ('passed', 'failed'):
+                self.test_results[key] += fixtures.test_results[key]
+            self.test_results['errors'].extend(fixtures.test_results['errors'])
+
+        print("\n" + "=" * 60)
+        print("🏁 LOAD TEST SUMMARY")
+        print("=" * 60)
+        print(f"{'Endpoint':<50} {'reqs':>7} {'req/s':>8} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8} {'err%':>6}")
+        for label, row in report.items():
+            print(f"{label:<50} {row['requests']:>7} {row['throughput_rps']:>8} {row['p50_ms']:>8} "
+                  f"{row['p95_ms']:>8} {row['p99_ms']:>8} {row['error_rate']:>6}")
+        print(f"\n✅ Scenario checks passed: {self.test_results['passed']}")
+        print(f"❌ Scenario checks failed: {self.test_results['failed']}")
+        self.print_server_metrics()
+        return report
+
+    def drive_virtual_users(self, fixtures, users, target_rps, ramp_up, duration, scenarios):
+        """Repeat the scenarios over the fixtures' records from concurrent virtual users until the deadline"""
+        stats = LoadTestStats()
+        limiter = RateLimiter(target_rps, ramp_up)
+        deadline = time.perf_counter() + duration
+        results_lock = threading.Lock()
+        # A requests.Session per user; the async and embedded backends are shared, they serve concurrent calls
+        shared_client = None if self.client_options["client"] == "sync" else self.session
+
+        def virtual_user(user_number):
+            user = SchoolManagementTester(session=TimedSession(stats, limiter, shared_client), verbose=False)
+            # Other users edit the same grades concurrently, so cached vs fresh reports can legitimately race
+            user.verify_report_cache = False
+            user.created_students = list(fixtures.created_students)
+            user.created_classes = list(fixtures.created_classes)
+            user.created_assignments = list(fixtures.created_assignments)
+            while time.perf_counter() < deadline:
+                for scenario in scenarios:
+                    getattr(user, scenario)()
+            user.session.close()
+            with results_lock:
+                self.test_results['passed'] += user.test_results['passed']
+                self.test_results['failed'] += user.test_results['failed']
+                self.test_results['errors'].extend(user.test_results['errors'])
+
+        stats.started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=users) as pool:
+            list(pool.map(virtual_user, range(users)))
+        stats.stop()
+        return stats.report()
+
+
+def run_suite_worker(worker, queues, options, barrier, results):
+    """Parallel worker process: run queued suites in a private namespace, then clean the namespace up.
+
+    queues holds one queue per phase of suite-name batches, each run in order by one worker and
+    ending with a None per worker; workers meet at the barrier between phases.
+    """
+    output = io.StringIO()
+    tester = SchoolManagementTester(**options)
+    try:
+        with contextlib.redirect_stdout(output):
+            try:
+                start = time.perf_counter()
+                tester.run_suites(FIXTURE_SUITES)
+                timings = [f"fixtures {time.perf_counter() - start:.2f}s"]
+                for phase, queue in enumerate(queues):
+                    if phase:
+                        barrier.wait(timeout=WORKER_TIMEOUT)
+                    start = time.perf_counter()
+                    suites = 0
+                    for batch in iter(lambda: queue.get(timeout=WORKER_TIMEOUT), None):
+                        tester.run_suites(batch)
+                        suites += len(batch)
+                    timings.append(f"phase {phase + 1} {suites} suites {time.perf_counter() - start:.2f}s")
+                barrier.wait(timeout=WORKER_TIMEOUT)
+                tester.log(f"\n⏱️  Worker {worker}: {', '.join(timings)}")
+            except threading.BrokenBarrierError:
+                tester.log_result(f"Worker {worker} Phase Barrier", False, "Another worker failed or timed out")
+            finally:
+                try:
+                    start = time.perf_counter()
+                    students, classes = tester.cleanup_namespace()
+                    tester.log(f"🧹 Removed {students} students and {classes} classes in {tester.id_prefix}* "
+                               f"in {time.perf_counter() - start:.2f}s")
+                except Exception as e:
+                    tester.log_result(f"Worker {worker} Cleanup", False, f"Error: {str(e)}")
+    finally:
+        tester.session.close()
+        results.put((worker, output.getvalue(), tester.test_results))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="School Management System backend tests")
+    parser.add_argument("--load-test", action="store_true",
+                        help="run the scenarios as concurrent virtual users instead of once")
+    parser.add_argument("--users", type=int, default=10, help="number of virtual users")
+    parser.add_argument("--rps", type=float, default=50.0, help="target request rate across all users")
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="seconds to ramp up to the target rate")
+    parser.add_argument("--duration", type=float, default=60.0, help="load-test duration in seconds")
+    parser.add_argument("--dashboard-benchmark", action="store_true",
+                        help="grow the students collection and check dashboard read latency stays flat")
+    parser.add_argument("--pagination-benchmark", action="store_true",
+                        help="page through a large students collection and check per-page cost stays constant")
+    parser.add_argument("--diagnostics", action="store_true",
+                        help="explain each endpoint's query against MONGO_URL and fail on collection scans")
+    parser.add_argument("--create-indexes", action="store_true",
+                        help="with --diagnostics, first create the startup indexes on the target database")
+    parser.add_argument("--generate-data", choices=sorted(DATASET_SCALES),
+                        help="seed a deterministic synthetic district dataset of the given scale and exit")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="random seed for generated datasets and rosters")
+    parser.add_argument("--load-via", choices=["db", "api"], default="db",
+                        help="load generated data with bulk database writes or through the API")
+    parser.add_argument("--export-check", choices=sorted(DATASET_SCALES),
+                        help="seed a dataset of the given scale into an empty database, export it and check "
+                             "the row counts against the generator")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="time every endpoint at several dataset sizes and compare with the baseline")
+    parser.add_argument("--bench-scales", default="small,medium",
+                        help="comma-separated dataset scales to benchmark at (seeded cumulatively)")
+    parser.add_argument("--bench-samples", type=int, default=30, help="timed samples per endpoint")
+    parser.add_argument("--baseline", default=BENCHMARK_BASELINE, help="benchmark baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="overwrite the baseline with this run's results")
+    parser.add_argument("--regression-threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="fractional median slowdown that counts as a regression when significant")
+    parser.add_argument("--import-benchmark", action="store_true",
+                        help="import a large roster in bulk and compare it with one-at-a-time creation")
+    parser.add_argument("--import-rows", type=int, default=50000, help="roster rows for --import-benchmark")
+    parser.add_argument("--import-sample", type=int, default=500,
+                        help="rows created one request at a time for the throughput comparison")
+    parser.add_argument("--import-format", choices=["csv", "ndjson"], default="csv",
+                        help="roster encoding for --import-benchmark")
+    parser.add_argument("--contract", action="store_true",
+                        help="also run the contract suites, for endpoints the backend does not provide yet")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="run the suites in this many parallel worker processes with isolated namespaces")
+    parser.add_argument("--fanout", choices=["inline", "background"], default="inline",
+                        help="create assignment grade records inline or as a polled background job")
+    parser.add_argument("--client", choices=["sync", "async", "embedded"], default="sync",
+                        help="HTTP client backend: blocking requests, pooled asyncio/httpx, or the backend app "
+                             "from BACKEND_DIR mounted in-process over an in-memory database")
+    parser.add_argument("--compare-embedded", action="store_true",
+                        help="run the suites against the live backend and the embedded app and compare results")
+    parser.add_argument("--max-connections", type=int, default=20,
+                        help="connection pool size for the async client backend")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    tester = SchoolManagementTester()
-    success = tester.run_all_tests()
+    args = parse_args()
+    tester = SchoolManagementTester(client=args.client, max_connections=args.max_connections,
+                                    fanout=args.fanout, contract=args.contract)
+    if args.load_test:
+        report = tester.run_load_test(users=args.users, target_rps=args.rps,
+                                      ramp_up=args.ramp_up, duration=args.duration)
+        success = (bool(report) and tester.test_results['failed'] == 0
+                   and all(row['error_rate'] == 0 for row in report.values()))
+    elif args.dashboard_benchmark:
+        tester.benchmark_dashboard_growth(seed=args.seed)
+        success = tester.test_results['failed'] == 0
+    elif args.export_check:
+        success = tester.run_export_check(args.export_check, seed=args.seed, load_via=args.load_via)
+    elif args.generate_data:
+        seed_dataset(args.generate_data, seed=args.seed, via=args.load_via, session=tester.session)
+        success = True
+    elif args.benchmark:
+        success = tester.run_benchmarks(scales=args.bench_scales.split(","), baseline_path=args.baseline,
+                                        update_baseline=args.update_baseline,
+                                        threshold=args.regression_threshold, samples=args.bench_samples,
+                                        seed=args.seed, load_via=args.load_via)
+    elif args.diagnostics:
+        success = tester.run_query_plan_diagnostics(create_indexes=args.create_indexes)
+    elif args.import_benchmark:
+        tester.benchmark_bulk_import(rows=args.import_rows, sample=args.import_sample,
+                                     fmt=args.import_format, seed=args.seed)
+        success = tester.test_results['failed'] == 0
+    elif args.pagination_benchmark:
+        tester.benchmark_pagination(seed=args.seed)
+        success = tester.test_results['failed'] == 0
+    elif args.compare_embedded:
+        success = tester.run_embedded_comparison()
+    elif args.workers > 1:
+        success = tester.run_parallel_tests(workers=args.workers)
+    else:
+        success = tester.run_all_tests()
+    tester.session.close()
     
     if success:
         print(f"\n🎉 All tests passed! Backend is working correctly.")
@@ -0,0 +1,415 @@
+"""
+Grade analytics for the School Management System: a vectorized grading engine
+for term and year rollups and a compact, memory-mappable gradebook for workers
+"""
+
+import json
+import math
+import mmap
+import struct
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # only needed for the vectorized grading engine
+    np = None
+
+
+LETTER_GRADE_THRESHOLDS = [(90, "A"), (80, "B"), (70, "C"), (60, "D")]
+GPA_POINTS = {"A": 4.0, "B": 3.0, "C": 2.0, "D": 1.0, "F": 0.0}
+
+
+def letter_grade(percentage):
+    for cutoff, letter in LETTER_GRADE_THRESHOLDS:
+        if percentage >= cutoff:
+            return letter
+    return "F"
+
+
+class GradingEngine:
+    """Columnar weighted-grade engine for term and year rollups across every class and student.
+
+    Runs over a CompactGradebook's arrays, which hold the one copy of the
+    interned data, and is the one implementation of the per-report weighting
+    rules: a grade's percentage is the one the API stored (points_earned /
+    points_possible * 100 through Python's round to 2 places, 0 when
+    points_possible is 0), a category grade is the mean percentage of its
+    submitted grades, and the overall percentage weights the categories that
+    have grades. Grades in a category the class does not define still count
+    towards completion. Reported figures are rounded with Python's round too,
+    since numpy's rounding can differ from it by 0.01.
+    """
+
+    def __init__(self, gradebook):
+        if np is None:
+            raise RuntimeError("The grading engine requires numpy (pip install numpy)")
+        self.gradebook = gradebook
+        self.tables = gradebook.tables
+        self.student_level = np.asarray(gradebook.student_level)
+        self.class_level = np.asarray(gradebook.class_level)
+        self.category_class = np.asarray(gradebook.category_class, dtype=np.int64)
+        self.category_weight = np.asarray(gradebook.category_weight)
+        self.assignment_class = np.asarray(gradebook.assignment_class, dtype=np.int64)
+        self.assignment_category = np.asarray(gradebook.assignment_category, dtype=np.int64)
+        self.assignment_points = np.asarray(gradebook.assignment_points)
+        self.assignment_due = np.array(self.tables["assignment_due_dates"], dtype=str)
+        offsets = np.asarray(gradebook.student_offsets)
+        self.grade_student = np.repeat(np.arange(len(self.student_level)), np.diff(offsets))
+        self.grade_assignment = np.asarray(gradebook.grade_assignment, dtype=np.int64)
+        self.grade_centipercent = np.asarray(gradebook.grade_centipercent)
+        self.grade_submitted = (np.asarray(gradebook.grade_flags) & gradebook.FLAG_SUBMITTED) > 0
+        # The gradebook is read-only, so rollups are computed once per term
+        self._rollups = {}
+
+    @classmethod
+    def from_api(cls, session, api_base, students, classes):
+        """Load the given students' grades in the given classes from the API at api_base"""
+        return cls(CompactGradebook.from_api(session, api_base, students, classes))
+
+    @classmethod
+    def from_generator(cls, generator):
+        return cls(CompactGradebook.from_records(generator.students, generator.classes, generator.categories,
+                                                 generator.assignments, generator.iter_grades()))
+
+    def percentages(self):
+        """Per-grade stored percentage, 0 for ungraded work and where points_possible is 0"""
+        possible = self.assignment_points[self.grade_assignment]
+        return np.where((possible > 0) & (self.grade_centipercent >= 0), self.grade_centipercent / 100, 0.0)
+
+    def rollup(self, term=None):
+        """Weighted totals for every enrolled (student, class) pair, optionally limited to a
+        (start, end) due-date term; returns dict of per-pair and per-(pair, category) arrays"""
+        term = tuple(term) if term else None
+        if term not in self._rollups:
+            self._rollups[term] = self._rollup(term)
+        return self._rollups[term]
+
+    def enrollment(self):
+        """Enrolled (student, class) pairs grouped by student, as (pair_student, pair_class, pair_start),
+        plus each class's position among its grade level's classes"""
+        n_students, n_classes = len(self.student_level), len(self.class_level)
+        n_levels = len(self.tables["levels"])
+        class_order = np.argsort(self.class_level, kind='stable')
+        level_start = np.concatenate(([0], np.cumsum(np.bincount(self.class_level, minlength=n_levels))))
+        class_rank = np.empty(n_classes, dtype=np.int64)
+        class_rank[class_order] = np.arange(n_classes) - level_start[self.class_level[class_order]]
+
+        pairs_per_student = np.diff(level_start)[self.student_level]
+        pair_start = np.concatenate(([0], np.cumsum(pairs_per_student)))
+        pair_student = np.repeat(np.arange(n_students), pairs_per_student)
+        pair_class = class_order[level_start[self.student_level[pair_student]]
+                                 + np.arange(len(pair_student)) - pair_start[pair_student]]
+        return pair_student, pair_class, pair_start, class_rank
+
+    def _rollup(self, term):
+        n_students, n_classes = len(self.student_level), len(self.class_level)
+        pair_student, pair_class, pair_start, class_rank = self.enrollment()
+        n_pairs = len(pair_student)
+
+        # Each pair owns its class's categories, kept in their per-class order so weighted sums
+        # add up in the same order as a report
+        category_order = np.argsort(self.category_class, kind='stable')
+        class_category_count = np.bincount(self.category_class, minlength=n_classes)
+        class_category_start = np.concatenate(([0], np.cumsum(class_category_count)))
+        category_rank = np.empty(len(self.category_class), dtype=np.int64)
+        category_rank[category_order] = (np.arange(len(self.category_class))
+                                         - class_category_start[self.category_class[category_order]])
+        pair_category_count = class_category_count[pair_class]
+        category_start = np.concatenate(([0], np.cumsum(pair_category_count)))
+        category_pair = np.repeat(np.arange(n_pairs), pair_category_count)
+        category = category_order[class_category_start[pair_class[category_pair]]
+                                  + np.arange(len(category_pair)) - category_start[category_pair]]
+
+        in_term = np.ones(len(self.assignment_class), dtype=bool)
+        if term:
+            in_term = (self.assignment_due >= term[0]) & (self.assignment_due <= term[1])
+        grade_class = self.assignment_class[self.grade_assignment]
+        enrolled = self.class_level[grade_class] == self.student_level[self.grade_student]
+        submitted = in_term[self.grade_assignment] & self.grade_submitted & enrolled
+        grade_pair = pair_start[self.grade_student] + class_rank[grade_class]
+
+        grade_category = self.assignment_category[self.grade_assignment]
+        scored = submitted & (grade_category >= 0)
+        key = category_start[grade_pair[scored]] + category_rank[grade_category[scored]]
+        size = len(category_pair)
+        category_sum = np.bincount(key, weights=self.percentages()[scored], minlength=size)
+        category_count = np.bincount(key, minlength=size)
+        has_grades = category_count > 0
+        category_mean = np.divide(category_sum, category_count, out=np.zeros(size), where=has_grades)
+
+        # Sum weighted category means into their pair, in category order
+        weight = self.category_weight[category]
+        total = np.bincount(category_pair, weights=np.where(has_grades, category_mean * weight, 0.0),
+                            minlength=n_pairs)
+        total_weight = np.bincount(category_pair, weights=np.where(has_grades, weight, 0.0), minlength=n_pairs)
+        overall = np.divide(total, total_weight, out=np.zeros(n_pairs), where=total_weight > 0)
+
+        total_assignments = np.bincount(self.assignment_class[in_term], minlength=n_classes)
+        return {
+            'pair_student': pair_student,
+            'pair_class': pair_class,
+            'overall': overall,
+            'completed': np.bincount(grade_pair[submitted], minlength=n_pairs),
+            'total_assignments': total_assignments[pair_class],
+            'category_start': category_start,
+            'category': category,
+            'category_mean': category_mean,
+            'category_has_grades': has_grades,
+        }
+
+    def reports(self, term=None, class_id=None):
+        """Progress reports for every enrolled (student, class) pair, or one class's, in the endpoint's shape"""
+        rollup = self.rollup(term)
+        pairs = range(len(rollup['pair_student']))
+        if class_id is not None:
+            pairs = np.nonzero(rollup['pair_class'] == self.gradebook.class_index[class_id])[0]
+        category_names = self.tables["category_names"]
+        for p in pairs:
+            s, c = rollup['pair_student'][p], rollup['pair_class'][p]
+            categories = range(rollup['category_start'][p], rollup['category_start'][p + 1])
+            category_grades = {category_names[self.gradebook.category_name[rollup['category'][k]]]:
+                               round(float(rollup['category_mean'][k]), 2)
+                               for k in categories if rollup['category_has_grades'][k]}
+            overall_percentage = round(float(rollup['overall'][p]), 2)
+            total = int(rollup['total_assignments'][p])
+            completed = int(rollup['completed'][p])
+            yield {
+                "student_id": self.tables["student_ids"][s],
+                "student_name": self.tables["student_names"][s],
+                "class_id": self.tables["class_ids"][c],
+                "class_name": self.tables["class_names"][c],
+                "overall_percentage": overall_percentage,
+                "letter_grade": letter_grade(overall_percentage),
+                "category_grades": category_grades,
+                "total_assignments": total,
+                "completed_assignments": completed,
+                "missing_assignments": total - completed,
+            }
+
+    def gpa_and_rank(self, term=None):
+        """4.0-scale GPA per student over enrolled classes and competition rank within grade level"""
+        rollup = self.rollup(term)
+        n_students = len(self.student_level)
+        # Letters exactly as reports() assigns them
+        points = np.array([GPA_POINTS[letter_grade(round(float(overall), 2))] for overall in rollup['overall']])
+        class_count = np.bincount(rollup['pair_student'], minlength=n_students)
+        gpa = np.divide(np.bincount(rollup['pair_student'], weights=points, minlength=n_students), class_count,
+                        out=np.zeros(n_students), where=class_count > 0)
+        gpa = np.array([round(float(value), 2) for value in gpa])
+        rank = np.zeros(n_students, dtype=np.int64)
+        for level in np.unique(self.student_level):
+            members = np.nonzero(self.student_level == level)[0]
+            # Competition ranking: 1 + number of classmates with a strictly higher GPA
+            ordered = np.sort(gpa[members])
+            rank[members] = 1 + len(members) - np.searchsorted(ordered, gpa[members], side='right')
+        return {student_id: {"gpa": float(gpa[i]), "rank": int(rank[i]),
+                             "grade_level": self.tables["levels"][self.student_level[i]]}
+                for i, student_id in enumerate(self.tables["student_ids"])}
+
+
+class CompactGradebook:
+    """Read-only gradebook for analytics workers, a fraction of the size of grade documents.
+
+    Students, classes, assignments and category names are interned to integer
+    indexes, and grades live in typed arrays grouped by student (CSR layout:
+    student i owns rows student_offsets[i]:student_offsets[i + 1]). Percentages
+    are stored as integer hundredths, which is exact for the API's 2-decimal
+    percentages, with -1 for ungraded work; points stay doubles so fractional
+    points read back exactly. A saved gradebook is loaded back
+    through a memory map, so many workers can share one copy. Progress
+    queries are answered by a GradingEngine over these arrays.
+    """
+
+    MAGIC = b"GRADEBK1"
+    FLAG_SUBMITTED = 1
+    FLAG_MISSING = 2
+    # Array name -> typecode; every array is stored in this order after the header
+    ARRAYS = {
+        "student_level": "h", "class_level": "h", "student_offsets": "q",
+        "category_class": "i", "category_name": "h", "category_weight": "d",
+        "assignment_class": "i", "assignment_category": "i", "assignment_points": "d",
+        "grade_assignment": "i", "grade_centipercent": "i", "grade_earned": "d", "grade_flags": "B",
+    }
+
+    def __init__(self, tables, arrays, buffer=None):
+        self.tables = tables
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self.buffer = buffer
+        self.student_index = {sid: i for i, sid in enumerate(tables["student_ids"])}
+        self.class_index = {cid: i for i, cid in enumerate(tables["class_ids"])}
+        self._engine = None
+
+    @classmethod
+    def from_records(cls, students, classes, categories, assignments, grades):
+        """Build from API-shaped documents; grades may be any iterable and are streamed once"""
+        levels = {}
+
+        def intern(table, value):
+            return table.setdefault(value, len(table))
+
+        tables = {"student_ids": [], "student_names": [], "class_ids": [], "class_names": [],
+                  "assignment_ids": [], "assignment_due_dates": [], "category_names": [], "levels": []}
+        arrays = {name: array(typecode) for name, typecode in cls.ARRAYS.items()}
+        student_index, class_index, assignment_index, category_names = {}, {}, {}, {}
+        for student in students:
+            student_index[student["id"]] = len(tables["student_ids"])
+            tables["student_ids"].append(student["id"])
+            tables["student_names"].append(f"{student['first_name']} {student['last_name']}")
+            arrays["student_level"].append(intern(levels, student["grade_level"]))
+        for class_obj in classes:
+            class_index[class_obj["id"]] = len(tables["class_ids"])
+            tables["class_ids"].append(class_obj["id"])
+            tables["class_names"].append(class_obj["name"])
+            arrays["class_level"].append(intern(levels, class_obj["grade_level"]))
+        class_category = {}
+        for category in categories:
+            if category["class_id"] in class_index:
+                class_category[(category["class_id"], category["name"])] = len(arrays["category_class"])
+                arrays["category_class"].append(class_index[category["class_id"]])
+                arrays["category_name"].append(intern(category_names, category["name"]))
+                arrays["category_weight"].append(category["weight_percentage"])
+        for assignment in assignments:
+            if assignment["class_id"] in class_index:
+                assignment_index[assignment["id"]] = len(tables["assignment_ids"])
+                tables["assignment_ids"].append(assignment["id"])
+                tables["assignment_due_dates"].append((assignment.get("due_date") or "")[:10])
+                arrays["assignment_class"].append(class_index[assignment["class_id"]])
+                arrays["assignment_category"].append(
+                    class_category.get((assignment["class_id"], assignment["category"]), -1))
+                arrays["assignment_points"].append(assignment["points_possible"])
+        tables["levels"] = list(levels)
+        tables["category_names"] = list(category_names)
+
+        # Stream grades into unsorted columns, then counting-sort them by student
+        grade_student, assignment_col = array("i"), array("i")
+        centi_col, earned_col, flags_col = array("i"), array("d"), array("B")
+        for grade in grades:
+            if grade["student_id"] not in student_index or grade["assignment_id"] not in assignment_index:
+                continue
+            grade_student.append(student_index[grade["student_id"]])
+            assignment_col.append(assignment_index[grade["assignment_id"]])
+            percentage = grade.get("percentage")
+            centi_col.append(-1 if percentage is None else round(percentage * 100))
+            earned = grade.get("points_earned")
+            earned_col.append(float("nan") if earned is None else earned)
+            flags_col.append((cls.FLAG_SUBMITTED if grade.get("is_submitted") else 0)
+                             | (cls.FLAG_MISSING if grade.get("is_missing") else 0))
+
+        offsets = array("q", [0] * (len(tables["student_ids"]) + 1))
+        for student in grade_student:
+            offsets[student + 1] += 1
+        for i in range(1, len(offsets)):
+            offsets[i] += offsets[i - 1]
+        cursor = array("q", offsets[:-1])
+        size = len(grade_student)
+        arrays["grade_assignment"] = array("i", bytes(4 * size))
+        arrays["grade_centipercent"] = array("i", bytes(4 * size))
+        arrays["grade_earned"] = array("d", bytes(8 * size))
+        arrays["grade_flags"] = array("B", bytes(size))
+        for row, student in enumerate(grade_student):
+            slot = cursor[student]
+            cursor[student] += 1
+            arrays["grade_assignment"][slot] = assignment_col[row]
+            arrays["grade_centipercent"][slot] = centi_col[row]
+            arrays["grade_earned"][slot] = earned_col[row]
+            arrays["grade_flags"][slot] = flags_col[row]
+        arrays["student_offsets"] = offsets
+        return cls(tables, arrays)
+
+    @classmethod
+    def from_api(cls, session, api_base, students, classes):
+        """Build from /api/students/{id}/grades plus each class's categories and assignments"""
+        categories, assignments = [], []
+        for class_obj in classes:
+            categories += session.get(f"{api_base}/classes/{class_obj['id']}/categories").json()
+            assignments += session.get(f"{api_base}/classes/{class_obj['id']}/assignments").json()
+
+        def grades():
+            for student in students:
+                yield from session.get(f"{api_base}/students/{student['id']}/grades").json()
+
+        return cls.from_records(students, classes, categories, assignments, grades())
+
+    def save(self, path):
+        """Write a header (string tables and array layout) followed by the 8-byte aligned arrays"""
+        layout, offset = {}, 0
+        for name, typecode in self.ARRAYS.items():
+            nbytes = len(getattr(self, name)) * array(typecode).itemsize
+            layout[name] = [offset, nbytes]
+            offset += nbytes + (-nbytes % 8)
+        header = json.dumps({"tables": self.tables, "layout": layout}).encode()
+        header += b" " * (-(len(self.MAGIC) + 8 + len(header)) % 8)
+        with open(path, "wb") as f:
+            f.write(self.MAGIC + struct.pack("<q", len(header)) + header)
+            for name in self.ARRAYS:
+                data = getattr(self, name)
+                data = data.tobytes() if isinstance(data, array) else bytes(data)
+                f.write(data + b"\0" * (-len(data) % 8))
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a saved gradebook; arrays are read-only views into the file"""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if buffer[:len(cls.MAGIC)] != cls.MAGIC:
+            buffer.close()
+            raise ValueError(f"{path} is not a saved gradebook")
+        header_length = struct.unpack_from("<q", buffer, len(cls.MAGIC))[0]
+        start = len(cls.MAGIC) + 8
+        header = json.loads(bytes(buffer[start:start + header_length]))
+        data = memoryview(buffer)[start + header_length:]
+        arrays = {name: data[offset:offset + nbytes].cast(cls.ARRAYS[name])
+                  for name, (offset, nbytes) in header["layout"].items()}
+        return cls(header["tables"], arrays, buffer=buffer)
+
+    def close(self):
+        # The engine's arrays are views of the mapped ones and must go before the map does
+        self._engine = None
+        if self.buffer is not None:
+            for name in self.ARRAYS:
+                view = getattr(self, name)
+                if isinstance(view, memoryview):
+                    view.release()
+            self.buffer.close()
+            self.buffer = None
+
+    def nbytes(self):
+        """Bytes held by the typed arrays (string tables excluded)"""
+        return sum(len(getattr(self, name)) * array(typecode).itemsize for name, typecode in self.ARRAYS.items())
+
+    def student_grades(self, student_id):
+        """The student's grades in the /api/students/{id}/grades field layout"""
+        s = self.student_index[student_id]
+        grades = []
+        for row in range(self.student_offsets[s], self.student_offsets[s + 1]):
+            a = self.grade_assignment[row]
+            earned = self.grade_earned[row]
+            centi = self.grade_centipercent[row]
+            grades.append({
+                "student_id": student_id,
+                "assignment_id": self.tables["assignment_ids"][a],
+                "class_id": self.tables["class_ids"][self.assignment_class[a]],
+                "points_earned": None if math.isnan(earned) else earned,
+                "percentage": None if centi < 0 else centi / 100,
+                "is_submitted": bool(self.grade_flags[row] & self.FLAG_SUBMITTED),
+                "is_missing": bool(self.grade_flags[row] & self.FLAG_MISSING),
+            })
+        return grades
+
+    def engine(self):
+        """The GradingEngine over this gradebook, built on first use"""
+        if self._engine is None:
+            self._engine = GradingEngine(self)
+        return self._engine
+
+    def progress_report(self, student_id, class_id):
+        """Same fields and weighting rules as /api/students/{id}/progress/{class_id}"""
+        s, c = self.student_index[student_id], self.class_index[class_id]
+        if self.student_level[s] != self.class_level[c]:
+            raise KeyError(f"Student {student_id} is not enrolled in class {class_id}")
+        return next(r for r in self.engine().reports(class_id=class_id) if r["student_id"] == student_id)
+
+    def class_reports(self, class_id):
+        """Reports for every student in the class's grade level"""
+        return list(self.engine().reports(class_id=class_id))